@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Estimation du courant résiduel (ligne de base) d'une acquisition.
+
+Aux temps longs, le courant mesuré suit la loi de Cottrell à laquelle
+s'ajoute un courant résiduel constant I∞ :
+    I = k/√t + I∞
+En posant x = 1/√t, c'est une droite I = k.x + I∞ : I∞ est l'ordonnée à
+l'origine de la droite ajustée par les moindres carrés sur la fin de
+l'acquisition. La valeur de correction à ajouter à I est alors -I∞.
+"""
+
+import math as m
+
+from linear_regression import linear_fit
+
+#Fraction de la durée de l'acquisition utilisée par défaut pour l'ajustement
+TAIL_FRACTION = 0.5
+
+def estimate_baseline(t, I, tail=TAIL_FRACTION):
+    """Ajuste `I = k/√t + I∞` sur la fin de l'acquisition.
+
+    Paramètres
+    ----------
+    t : list
+        Tableau de valeurs des temps, croissantes, l'origine étant le saut de
+        potentiel.
+    I : list
+        Tableau de valeurs des intensités.
+    tail : float
+        Fraction de la durée de l'acquisition, prise à la fin, sur laquelle
+        l'ajustement est fait.
+
+    Retour
+    ------
+    baseline : float
+        Courant résiduel I∞.
+    k : float
+        Coefficient de la loi de Cottrell, k = n.F.S.C.√(D/π).
+
+    Lève une `ValueError` s'il y a moins de 3 points utilisables.
+    """
+    if not len(t):
+        raise ValueError("aucun point")
+    tstart = t[-1] - tail*(t[-1] - t[0])
+    x = []
+    y = []
+    for tv, Iv in zip(t, I):
+        if tv >= tstart and tv > 0:
+            x.append(1/m.sqrt(tv))
+            y.append(Iv)
+    if len(x) < 3 or x[0] == x[-1]:
+        raise ValueError("pas assez de points pour estimer la ligne de base")
+    k, baseline = linear_fit(x, y)
+    return baseline, k
+
+def estimate_correction(t, I, tail=TAIL_FRACTION):
+    """Retourne la valeur de correction à ajouter à I pour annuler le
+    courant résiduel estimé par `estimate_baseline`.
+    """
+    return -estimate_baseline(t, I, tail)[0]
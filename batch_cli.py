@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""Calcul du coefficient de diffusion sur un lot d'acquisitions, sans Kivy.
+
+Chaque fichier est traité comme dans l'application : lecture (`DataReader`),
+sélection de l'intervalle de travail et correction de I (`TabOperations`),
+puis régression linéaire log-log et calcul de D (`LinearRegression`). Les
+fichiers sont répartis sur plusieurs processus et le résumé est écrit en CSV
+ou en JSON.
+
+Utilisation :
+    `python batch_cli.py acquisitions/*.crv -n 1 -S 0.5 -C 1e-3
+                         [--tmin 0.5] [--tmax 10] [--correction 0]
+                         [--polarity abs] [--jobs 4] [--output resume.csv]
+                         [--fit-global]`
+
+Un dossier donné en argument est remplacé par les fichiers csv et crv qu'il
+contient. `-S` et `-C` acceptent une valeur par fichier (série de 
+concentrations par exemple). Avec `--fit-global`, un D unique est de plus 
+ajusté sur l'ensemble des fichiers (voir `global_fit`) et ajouté au résumé 
+sous le nom "(global)".
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from data_reader import DataReader
+from tab_operations import TabOperations
+from linear_regression import LinearRegression, POLARITIES
+from global_fit import fit_global_D, log_offset, log_statistics
+
+EXTENSIONS = (".csv", ".crv")
+
+#Colonnes du résumé, dans l'ordre
+FIELDS = ("file", "n", "S", "C", "tmin", "tmax", "correction", "points",
+          "excluded", "slope", "intercept", "D", "error")
+
+#Valeurs de --polarity et conventions de signe correspondantes
+POLARITY_NAMES = dict(zip(("abs", "positive", "negative"), POLARITIES))
+
+def list_files(paths):
+    """Remplace les dossiers de `paths` par les fichiers csv et crv qu'ils
+    contiennent.
+
+    Retour
+    ------
+    Liste des fichiers à traiter.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                    os.path.join(path, name) for name in os.listdir(path)
+                    if os.path.splitext(name)[1].lower() in EXTENSIONS))
+        else:
+            files.append(path)
+    return files
+
+def analyse_file(filename, n, S, C, tmin=None, tmax=None, correction=0.,
+                 statistics=False, polarity='abs'):
+    """Calcule D pour l'acquisition `filename`.
+
+    Paramètres
+    ----------
+    filename : str
+        Fichier csv ou crv à lire.
+    n : int
+        Nombre d'électrons échangés au cours de la réaction.
+    S : float
+        Surface d'échange.
+    C : float
+        Concentration de l'espèce.
+    tmin, tmax : float or None
+        Intervalle de travail. Par défaut, toute l'acquisition.
+    correction : float
+        Valeur ajoutée à toutes les intensités.
+    statistics : bool
+        Si `True`, le résultat contient aussi la clé "statistics" : les 
+        sommes utilisées par `global_fit.fit_global_D`.
+    polarity : 'abs', 1 or -1
+        Convention de signe du courant, voir `linear_regression.log_mask`.
+
+    Retour
+    ------
+    Dictionnaire dont les clés sont `FIELDS`. En cas d'échec, `error` contient
+    le message d'erreur et les résultats valent None.
+    """
+    result = dict.fromkeys(FIELDS)
+    result.update(file=filename, n=n, S=S, C=C, correction=correction)
+    try:
+        reader = DataReader(filename)
+        exptRaw, expIRaw = reader.get_t(), reader.get_I()
+        if not exptRaw:
+            raise ValueError("aucune valeur lue")
+        result["tmin"] = min(exptRaw) if tmin is None else tmin
+        result["tmax"] = max(exptRaw) if tmax is None else tmax
+        expt, expI = TabOperations.del_values_not_between_tmin_tmax(
+                exptRaw, expIRaw, result["tmin"], result["tmax"])
+        expI = TabOperations.add_x_to_tab(expI, correction)
+        regression = LinearRegression(expt, expI, polarity)
+        regression.logexp_curves_tab(expt, expI)
+        result["points"] = len(regression.logexpt)
+        result["excluded"] = regression.excluded
+        if len(regression.logexpt) < 3:
+            raise ValueError("moins de 3 points utilisables dans l'intervalle")
+        slope, intercept = regression.linregress()
+        result.update(slope=slope, intercept=intercept,
+                      D=regression.calculate_D(intercept, n, S, C))
+        if statistics:
+            #Mêmes points que la régression, voir `FitAcquisition.log_values`
+            offset = log_offset(n, S, C)
+            result["statistics"] = log_statistics(
+                    regression.logexpt,
+                    [value - offset for value in regression.logexpI])
+    except (OSError, ValueError, ZeroDivisionError) as err:
+        result["error"] = "{}: {}".format(type(err).__name__, err)
+    return result
+
+def _analyse(job):
+    return analyse_file(*job)
+
+def run(files, n, S, C, tmin=None, tmax=None, correction=0., jobs=None,
+        statistics=False, polarity='abs'):
+    """Traite `files` en parallèle sur `jobs` processus (par défaut, autant
+    que de processeurs). Avec `jobs=1`, tout est traité dans le processus
+    courant. `S` et `C` peuvent être des listes donnant une valeur par 
+    fichier.
+
+    Retour
+    ------
+    Liste des résultats de `analyse_file`, dans l'ordre de `files`.
+    """
+    if not isinstance(S, (list, tuple)):
+        S = [S]*len(files)
+    if not isinstance(C, (list, tuple)):
+        C = [C]*len(files)
+    jobs_args = [(filename, n, S_file, C_file, tmin, tmax, correction,
+                  statistics, polarity)
+                 for filename, S_file, C_file in zip(files, S, C)]
+    if jobs == 1 or len(files) < 2:
+        return [_analyse(job) for job in jobs_args]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_analyse, jobs_args,
+                                 chunksize=max(1, len(files)//64)))
+
+def write_summary(results, file, fmt):
+    """Écrit `results` dans le fichier ouvert `file` au format `fmt`
+    ("csv" ou "json").
+    """
+    if fmt == "json":
+        json.dump(results, file, indent=2)
+        file.write("\n")
+    else:
+        writer = csv.DictWriter(file, fieldnames=FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(results)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+            description="Calcule le coefficient de diffusion D d'un lot "
+                        "d'acquisitions chronoampérométriques.")
+    parser.add_argument("paths", nargs="+",
+                        help="fichiers csv/crv ou dossiers à traiter")
+    parser.add_argument("-n", type=int, required=True,
+                        help="nombre d'électrons échangés")
+    parser.add_argument("-S", type=float, nargs="+", required=True,
+                        help="surface d'échange (une valeur, ou une par "
+                             "fichier)")
+    parser.add_argument("-C", type=float, nargs="+", required=True,
+                        help="concentration de l'espèce (une valeur, ou une "
+                             "par fichier)")
+    parser.add_argument("--tmin", type=float, default=None,
+                        help="début de l'intervalle de travail")
+    parser.add_argument("--tmax", type=float, default=None,
+                        help="fin de l'intervalle de travail")
+    parser.add_argument("--correction", type=float, default=0.,
+                        help="valeur ajoutée à toutes les intensités")
+    parser.add_argument("--polarity", choices=tuple(POLARITY_NAMES), 
+                        default="abs",
+                        help="signe du courant : valeur absolue (défaut), "
+                             "courants positifs ou négatifs seulement ; les "
+                             "autres points sont exclus")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="nombre de processus (défaut : nombre de CPU)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="fichier de résumé (défaut : sortie standard)")
+    parser.add_argument("--format", choices=("csv", "json"), default=None,
+                        help="format du résumé (défaut : d'après l'extension "
+                             "de --output, sinon csv)")
+    parser.add_argument("--fit-global", action="store_true",
+                        help="ajuste aussi un D unique sur tous les fichiers")
+    parser.add_argument("--equal-weights", action="store_true",
+                        help="avec --fit-global, donne le même poids à chaque "
+                             "fichier quel que soit son nombre de points")
+    return parser.parse_args(argv)
+
+def global_result(results, equal_weights=False):
+    """Ajuste un D unique sur les fichiers de `results` traités avec succès.
+
+    Retour
+    ------
+    Dictionnaire dont les clés sont `FIELDS`, nommé "(global)".
+    """
+    succeeded = [result for result in results if not result["error"]]
+    result = dict.fromkeys(FIELDS)
+    result["file"] = "(global)"
+    try:
+        fit = fit_global_D([result["statistics"] for result in succeeded],
+                           equal_weights)
+    except ValueError as err:
+        result["error"] = "{}: {}".format(type(err).__name__, err)
+    else:
+        result.update(points=fit.points, slope=fit.slope,
+                      intercept=fit.intercept, D=fit.D)
+    return result
+
+def main(argv=None):
+    args = parse_args(argv)
+    fmt = args.format
+    if fmt is None:
+        fmt = "json" if args.output and args.output.lower().endswith(".json") else "csv"
+
+    files = list_files(args.paths)
+    for name, values in (("S", args.S), ("C", args.C)):
+        if len(values) not in (1, len(files)):
+            print("{} : une valeur ou une par fichier ({}) attendue".format(
+                    name, len(files)), file=sys.stderr)
+            return 2
+    S = args.S[0] if len(args.S) == 1 else args.S
+    C = args.C[0] if len(args.C) == 1 else args.C
+
+    results = run(files, args.n, S, C, args.tmin, args.tmax, args.correction,
+                  args.jobs, args.fit_global, POLARITY_NAMES[args.polarity])
+    if args.fit_global:
+        results.append(global_result(results, args.equal_weights))
+        for result in results:
+            result.pop("statistics", None)
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding="UTF-8") as file:
+            write_summary(results, file, fmt)
+    else:
+        write_summary(results, sys.stdout, fmt)
+
+    failed = [result for result in results if result["error"]]
+    for result in failed:
+        print("{} : {}".format(result["file"], result["error"]), file=sys.stderr)
+    return 1 if failed and len(failed) == len(results) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""Mesures de performances des parties critiques de l'application.
+
+Les bancs d'essai se lancent depuis la racine du projet, par exemple :
+    `python -m benchmarks.bench_numeric --quick --output bench.json`
+"""
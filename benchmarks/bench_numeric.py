@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Banc d'essai des calculs numériques, sans Kivy.
+
+Mesure la lecture des fichiers (`DataReader`), la génération des courbes
+théoriques (`linspace`, `cottrell_curve_gen`, `cox_curve`), la régression
+linéaire et la sélection d'intervalle, pour des tailles d'acquisition 
+croissantes. Les résultats sont écrits en JSON pour pouvoir être comparés 
+d'un commit à l'autre.
+
+Utilisation :
+    `python -m benchmarks.bench_numeric [--quick] [--sizes N ...] 
+                                        [--repeat R] [--output fichier.json]`
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.common import summarize, time_call, write_results
+from benchmarks import synthetic
+from data_reader import DataReader
+from tab_operations import TabOperations
+from linear_regression import LinearRegression
+import cottrell.cottrell_math as cm
+from cottrell.cox_math import cox_curve
+
+SIZES = (10**3, 10**4, 10**5, 10**6, 10**7)
+QUICK_SIZES = (10**3, 10**4, 10**5)
+
+def bench_size(n_rows, repeat, tmpdir):
+    """Mesure toutes les fonctions pour une acquisition de `n_rows` points.
+    
+    Retour
+    ------
+    Liste des résultats, un dictionnaire par fonction.
+    """
+    t, I, E = synthetic.acquisition(n_rows)
+    positive_I = synthetic.log_values(I)
+    crv = os.path.join(tmpdir, "bench.crv")
+    csv = os.path.join(tmpdir, "bench.csv")
+    synthetic.write_crv(crv, t, I, E)
+    synthetic.write_csv(csv, t, I)
+    x = synthetic.x_positions(n_rows)
+    regression = LinearRegression(t, positive_I)
+    tmin, tmax = t[len(t)//10], t[-len(t)//10]
+    
+    cases = [
+        ("DataReader.crv", lambda: DataReader(crv)),
+        ("DataReader.csv", lambda: DataReader(csv)),
+        ("linspace", lambda: cm.linspace(0, t[-1], n_rows)),
+        ("cottrell_curve_gen", lambda: cm.cottrell_curve_gen(1, 0.25, 10**-5, 
+                                                             10**-5, t)),
+        ("cox_curve", lambda: cox_curve(10**-5, 20, x)),
+        ("LinearRegression.logexp_and_linear_curves_tab",
+         lambda: regression.logexp_and_linear_curves_tab(t, positive_I)),
+        ("TabOperations.del_values_not_between_tmin_tmax",
+         lambda: TabOperations.del_values_not_between_tmin_tmax(t, I, tmin, 
+                                                                tmax)),
+    ]
+    results = []
+    for name, func in cases:
+        result = {"name": name, "n": n_rows}
+        result.update(summarize(time_call(func, repeat)))
+        results.append(result)
+        print("{:<50} n={:<9} min={:.6f}s".format(name, n_rows, result["min"]),
+              file=sys.stderr)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs='+', default=None,
+                        help="nombres de points des acquisitions mesurées")
+    parser.add_argument("--quick", action="store_true",
+                        help="n'utilise que les petites tailles ({})"
+                        .format(", ".join(map(str, QUICK_SIZES))))
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="nombre de mesures par fonction")
+    parser.add_argument("--output", default=None,
+                        help="fichier JSON de sortie (sortie standard sinon)")
+    args = parser.parse_args(argv)
+    
+    sizes = args.sizes or (QUICK_SIZES if args.quick else SIZES)
+    tmpdir = tempfile.mkdtemp(prefix="redoxlab-bench-")
+    try:
+        results = []
+        for n_rows in sizes:
+            results.extend(bench_size(n_rows, args.repeat, tmpdir))
+    finally:
+        shutil.rmtree(tmpdir)
+    write_results(args.output, "numeric", results)
+
+if __name__ == '__main__':
+    main()
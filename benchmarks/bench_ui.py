@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Banc d'essai de la latence de l'interface, sans écran.
+
+Pilote l'application comme le ferait un utilisateur (modification d'un 
+paramètre, zoom, chargement d'un fichier, graphique de régression linéaire,
+popup Cox) et mesure pour chaque image le temps de calcul (l'appel de la
+méthode) et le temps de dessin (le tour de boucle Kivy qui suit : 
+déclencheurs de `Clock`, redessin des graphiques et affichage).
+
+Par défaut la fenêtre SDL2 est créée avec le pilote vidéo `offscreen`, ce qui 
+permet de lancer les mesures sur une machine Linux sans écran. `--mock-gl` 
+utilise le backend OpenGL factice de Kivy : seul le temps de calcul reste 
+alors significatif.
+
+Utilisation :
+    `python -m benchmarks.bench_ui [--frames N] [--sizes N ...] 
+                                   [--mock-gl] [--output fichier.json]`
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import summarize, write_results
+from benchmarks import synthetic
+
+def setup_environment(mock_gl=False):
+    """Configure Kivy pour fonctionner sans écran. Doit être appelée avant le
+    premier import de Kivy.
+    """
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    os.environ.setdefault("KIVY_WINDOW", "sdl2")
+    os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+    if mock_gl:
+        os.environ["KIVY_GL_BACKEND"] = "mock"
+
+class FrameRecorder:
+    """Enregistre les temps de calcul et de dessin de chaque image d'un 
+    scénario.
+    """
+    def __init__(self, event_loop):
+        self.event_loop = event_loop
+        self.scenarios = {}
+        
+    def frame(self, scenario, action):
+        """Exécute `action` puis un tour de boucle Kivy, et enregistre les 
+        deux durées dans `scenario`.
+        """
+        start = time.perf_counter()
+        action()
+        computed = time.perf_counter()
+        self.event_loop.idle()
+        drawn = time.perf_counter()
+        compute, draw = self.scenarios.setdefault(scenario, ([], []))
+        compute.append(computed-start)
+        draw.append(drawn-computed)
+    
+    def results(self):
+        results = []
+        for (name, n), (compute, draw) in self.scenarios.items():
+            results.append({"name": name, "n": n, 
+                            "compute": summarize(compute),
+                            "draw": summarize(draw),
+                            "total": summarize([c+d for c, d in 
+                                                zip(compute, draw)])})
+        return results
+
+def start_app():
+    """Construit l'application et sa fenêtre sans lancer la boucle 
+    principale.
+    """
+    from kivy.base import EventLoop
+    from kivy.core.window import Window
+    from main import AppApp
+    
+    app = AppApp()
+    app.load_config()
+    root = app.build()
+    Window.add_widget(root)
+    EventLoop.ensure_window()
+    EventLoop.start()
+    EventLoop.idle()
+    return app, root, EventLoop
+
+def run(sizes, frames, tmpdir):
+    app, root, event_loop = start_app()
+    recorder = FrameRecorder(event_loop)
+    graph = root.mainGraph
+    
+    def plot_center():
+        x, y = graph.graph._plot_area.pos
+        width, height = graph.get_canvas().get_plot_area_size()
+        return x + width/2, y + height/2
+    
+    def change_D(k):
+        def action():
+            root.buttonDth.value = 10**-5 * (1 + (k % 10)/10)
+            root.update_values(root.buttonDth, str(root.buttonDth.value))
+        return action
+    
+    def zoom(k):
+        factor = 1.05 if (k//10) % 2 == 0 else 1/1.05
+        return lambda: graph.zoom(factor, factor, *plot_center())
+    
+    for k in range(frames):
+        recorder.frame(("spinbox.theoric", 0), change_D(k))
+    for k in range(frames):
+        recorder.frame(("zoom.theoric", 0), zoom(k))
+        
+    for n_rows in sizes:
+        t, I, E = synthetic.acquisition(n_rows)
+        #Valeurs positives pour pouvoir afficher la régression linéaire
+        I = synthetic.log_values(I)
+        filename = "ui-{}.crv".format(n_rows)
+        synthetic.write_crv(os.path.join(tmpdir, filename), t, I, E)
+        
+        recorder.frame(("load_exp_data", n_rows), 
+                       lambda: root.load_exp_data(tmpdir, filename))
+        recorder.frame(("display_experimental", n_rows), 
+                       lambda: setattr(root.expCurveSwitch, "active", True))
+        for k in range(frames):
+            recorder.frame(("spinbox.main_graph", n_rows), change_D(k))
+        for k in range(frames):
+            recorder.frame(("zoom.main_graph", n_rows), zoom(k))
+        
+        recorder.frame(("regression.open", n_rows), 
+                       lambda: setattr(root.ids['dCurveCheckBox'], "active", 
+                                       True))
+        for k in range(frames):
+            recorder.frame(("spinbox.regression", n_rows), change_D(k))
+        recorder.frame(("regression.close", n_rows), 
+                       lambda: setattr(root.ids['dCurveCheckBox'], "active", 
+                                       False))
+        recorder.frame(("hide_experimental", n_rows),
+                       lambda: setattr(root.expCurveSwitch, "active", False))
+    
+    #Le popup ouvert est attaché à la fenêtre
+    from kivy.core.window import Window
+    from components.cox_popup import CoxPopup
+    recorder.frame(("cox_popup.open", 0), 
+                   lambda: root.on_cox_button_active(None))
+    popup = [w for w in Window.children if isinstance(w, CoxPopup)][0]
+    #Le curseur parcourt tout l'intervalle, quelle que soit son étendue
+    for k in range(frames):
+        recorder.frame(("cox_popup.slider", 0),
+                       lambda: setattr(popup.sliderCoxT, "value", 
+                                       popup.mint + (popup.maxt - popup.mint)
+                                                    *(k + 1)/frames))
+    popup.dismiss()
+    event_loop.idle()
+    return recorder.results()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs='+', 
+                        default=[10**3, 10**4, 10**5],
+                        help="nombres de points des acquisitions chargées")
+    parser.add_argument("--frames", type=int, default=50,
+                        help="nombre d'images mesurées par scénario")
+    parser.add_argument("--mock-gl", action="store_true",
+                        help="utilise le backend OpenGL factice de Kivy")
+    parser.add_argument("--output", default=None,
+                        help="fichier JSON de sortie (sortie standard sinon)")
+    args = parser.parse_args(argv)
+    
+    setup_environment(args.mock_gl)
+    tmpdir = tempfile.mkdtemp(prefix="redoxlab-bench-")
+    try:
+        results = run(args.sizes, args.frames, tmpdir)
+    finally:
+        shutil.rmtree(tmpdir)
+    write_results(args.output, "ui", results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Outils communs aux bancs d'essai : chronométrage, statistiques et
+enregistrement des résultats au format JSON.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values, p):
+    """Calcule le `p`-ième centile (interpolation linéaire) de `values`.
+    
+    Paramètres
+    ----------
+    values : list
+        Valeurs mesurées.
+    p : float
+        Centile voulu, entre 0 et 100.
+    """
+    values = sorted(values)
+    if not values:
+        return float('nan')
+    pos = (len(values)-1)*p/100
+    low = int(pos)
+    high = min(low+1, len(values)-1)
+    return values[low] + (values[high]-values[low])*(pos-low)
+
+def summarize(durations):
+    """Résume une liste de durées (en secondes).
+    """
+    return {"runs": len(durations),
+            "min": min(durations),
+            "mean": sum(durations)/len(durations),
+            "p50": percentile(durations, 50),
+            "p95": percentile(durations, 95),
+            "p99": percentile(durations, 99),
+            "max": max(durations)}
+
+def time_call(func, repeat=3, setup=None):
+    """Chronomètre `repeat` appels de `func`.
+    
+    Paramètres
+    ----------
+    func : callable
+        Fonction à chronométrer, appelée sans argument.
+    repeat : int
+        Nombre de mesures.
+    setup : callable
+        Fonction appelée avant chaque mesure, non chronométrée.
+    
+    Retour
+    ------
+    Liste des durées en secondes.
+    """
+    durations = []
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter()-start)
+    return durations
+
+def git_revision():
+    """Retourne le commit courant du dépôt, ou `None` hors d'un dépôt git.
+    """
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL
+                                       ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(path, suite, results):
+    """Écrit les résultats dans le fichier JSON `path` (ou sur la sortie 
+    standard si `path` vaut `None`), avec de quoi les comparer d'un commit à
+    l'autre.
+    
+    Paramètres
+    ----------
+    path : str or None
+        Fichier de sortie.
+    suite : str
+        Nom du banc d'essai.
+    results : list of dict
+        Une entrée par mesure, contenant au moins "name" et "n".
+    """
+    document = {"suite": suite,
+                "commit": git_revision(),
+                "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "results": results}
+    if path is None:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(path, 'w') as file:
+            json.dump(document, file, indent=2)
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""Génération d'acquisitions synthétiques pour les bancs d'essai.
+
+Les fichiers CRV reprennent le format VoltaLab du fichier d'exemple
+`TP08 - Exp1 Pt FeCN courbe i(t)004.CRV` : 8 lignes d'en-tête, le nombre de
+points puis une ligne par point `t	I	E	0` séparée par des tabulations.
+"""
+
+import math
+import random
+
+import cottrell.cottrell_math as cm
+
+#En-tête du fichier d'exemple (encodé en ISO-8859-15)
+CRV_HEADER = (b"\xfe\xab4 4\r\n"
+              b"TIER\r\n"
+              b"Experiment\r\n"
+              b"/7/0/0/0/1/0/0/0/7/-300/20/400/120/1/0.1/-100/100/0/0/1/1/0/7\r\n"
+              b"  1.000\r\n"
+              b"  1.000\r\n"
+              b"VoltaLab\r\n"
+              b"/2014/7/5/11/17/39/48/562\r\n")
+
+def acquisition(n_rows, dt=0.1, n=1, S=0.25, C=10**-5, D=10**-5, E=-0.3, 
+                noise=0.01, seed=0):
+    """Crée une acquisition de Cottrell bruitée, en courant de réduction 
+    (négatif) comme le fichier d'exemple.
+    
+    Paramètres
+    ----------
+    n_rows : int
+        Nombre de points.
+    dt : float
+        Pas de temps (s).
+    n, S, C, D : float
+        Paramètres de l'équation de Cottrell.
+    E : float
+        Potentiel appliqué (V).
+    noise : float
+        Bruit relatif ajouté à l'intensité.
+    seed : int
+        Graine du générateur aléatoire, pour des données reproductibles.
+    
+    Retour
+    ------
+    t, I, E : list
+        Tableaux des temps, intensités et potentiels.
+    """
+    rand = random.Random(seed)
+    t = [dt*(i+1) for i in range(n_rows)]
+    I = cm.cottrell_curve_gen(n, S, C, D, t)
+    I = [-i*(1 + noise*rand.uniform(-1, 1)) for i in I]
+    return t, I, [E]*n_rows
+
+def write_crv(filename, t, I, E):
+    """Écrit une acquisition au format CRV.
+    """
+    with open(filename, 'wb') as file:
+        file.write(CRV_HEADER)
+        file.write("{}\r\n".format(len(t)).encode())
+        for row in zip(t, I, E):
+            file.write("{:.5e}\t{:.5e}\t{:.5e}\t0.00000e+000\r\n"
+                       .format(*row).encode())
+
+def write_csv(filename, t, I):
+    """Écrit une acquisition au format CSV (séparateur `,`).
+    """
+    with open(filename, 'w', newline='', encoding="UTF-8") as file:
+        file.write("Temps (s),Intensité (A)\r\n")
+        for row in zip(t, I):
+            file.write("{!r},{!r}\r\n".format(*row))
+
+def x_positions(num, stop=0.1):
+    """Positions `x` utilisées par la courbe Cox.
+    """
+    return cm.linspace(0, stop, num)
+
+def log_values(values):
+    """Valeurs strictement positives, utilisables par la régression 
+    linéaire en log-log.
+    """
+    return [math.fabs(v) for v in values]
@@ -24,6 +24,7 @@ source.include_exts = py,png,jpg,kv,atlas,crv,json
 
 # (list) List of directory to exclude (let empty to not exclude anything)
 #source.exclude_dirs = tests, bin
+source.exclude_dirs = benchmarks, kv_bundles
 
 # (list) List of exclusions using pattern matching
 #source.exclude_patterns = license,images/*/*.jpg
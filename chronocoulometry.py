@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Chronocoulométrie : charge cumulée et droite d'Anson.
+
+La charge Q(t) est l'intégrale du courant depuis le saut de potentiel. Pour
+une espèce qui diffuse vers l'électrode (équation d'Anson) :
+    Q(t) = 2.n.F.S.C.√(D/π).√t + Q_dl + n.F.S.Γ
+Q est donc une droite en fonction de √t : D se déduit du coefficient
+directeur a, D = π.(a/(2.n.F.S.C))², et l'ordonnée à l'origine est la charge
+de la double couche et des espèces adsorbées. L'intégration moyenne le bruit
+du courant, ce qui permet d'exploiter des acquisitions plus courtes.
+"""
+
+import math as m
+from array import array
+from itertools import accumulate, chain, islice
+from operator import add, sub, mul
+
+from linear_regression import LinearRegression, linear_fit
+
+def cumulative_trapezoid(t, I):
+    """Intègre `I` en fonction de `t` par la méthode des trapèzes, de façon
+    cumulée.
+
+    Retour
+    ------
+    Q : array.array
+        Charge depuis le premier point : `Q[0] = 0` et `Q[k]` est l'intégrale
+        de `I` entre `t[0]` et `t[k]`.
+    """
+    if not len(t):
+        return array('d')
+    dt = map(sub, islice(t, 1, None), t)
+    sums = map(add, islice(I, 1, None), I)
+    areas = (0.5*area for area in map(mul, dt, sums))
+    return array('d', chain((0.,), accumulate(areas)))
+
+class Chronocoulometry:
+    """Permet d'effectuer la régression linéaire de la charge en fonction de
+    √t (droite d'Anson) sur les valeurs expérimentales.
+    """
+
+    def __init__(self, t, I):
+        """
+        Paramètres
+        ----------
+        t : list
+            Tableau de valeurs des temps expérimentaux, depuis le saut de
+            potentiel.
+        I : list
+            Tableau de valeurs des intensités mesurées expérimentalement.
+        """
+        self.t=t
+        self.I=I
+        self.Dexp=0
+
+    F = LinearRegression.F  #Constante de Faraday
+
+    def charge_curves_tab(self, expt, expI):
+        """Calcule les listes de √t et de la charge cumulée Q(t).
+
+        Paramètres
+        ----------
+        expt : list
+            Tableau de valeurs des temps expérimentaux.
+        expI : list
+            Tableau de valeurs des intensités expérimentales.
+        """
+        self.sqrtt = array('d', map(m.sqrt, expt))
+        self.Q = cumulative_trapezoid(expt, expI)
+
+    def anson_fit(self):
+        """Ajuste la droite d'Anson Q = a.√t + b par les moindres carrés.
+
+        Retour
+        ------
+        slope : float
+            Coefficient directeur a.
+        intercept : float
+            Ordonnée à l'origine b.
+        """
+        return linear_fit(self.sqrtt, self.Q)
+
+    def calculate_D(self, slope, n, S, C):
+        """Calcule le coefficient de diffusion D à partir du coefficient
+        directeur `slope` de la droite d'Anson.
+
+        Paramètres
+        ----------
+        slope : float
+            Coefficient directeur de la droite d'Anson.
+        n : int
+            Nombre d'électrons échangés au cours de la réaction.
+        S : float
+            Surface d'échange.
+        C : float
+            Concentration de l'espèce.
+
+        Retour
+        ------
+        D : float
+            Coefficient de diffusion retrouvé expérimentalement
+        """
+        D = m.pi*(slope/(2*n*self.F*S*C))**2
+        self.Dexp=D
+        return D
+
+    def adsorbed_charge(self, slope, intercept):
+        """Retourne la charge à l'origine de la droite d'Anson (double couche
+        et espèces adsorbées), du même signe que la charge de diffusion.
+        """
+        return intercept if slope >= 0 else -intercept
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from kivy.properties import  StringProperty, NumericProperty
+from kivy.properties import  StringProperty, NumericProperty, BooleanProperty
 
 from kivy.uix.boxlayout import BoxLayout
 from .entrypopup import EntryPopup
@@ -25,6 +25,8 @@ class IntervalBox(BoxLayout):
     
     correction_I = NumericProperty(0)
     _display_value_correction_I = StringProperty("0")
+    #Vrai si `correction_I` a été estimée automatiquement (voir `baseline`)
+    correction_I_estimated = BooleanProperty(False)
     
 
 
@@ -65,7 +67,9 @@ class IntervalBox(BoxLayout):
     def change_value_button_correction_I(self, popup):
         value = self.evaluation(popup.returnValue)
         #Si value == "", self.value ne change pas de valeur.
-        self.correction_I = value if value is not None else self.correction_I
+        if value is not None:
+            self.correction_I = value
+            self.correction_I_estimated = False
          
         self._display_value_correction_I = self.convert_to_scientific_notation(self.correction_I)
 
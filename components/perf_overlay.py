@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+from kivy.uix.label import Label
+from kivy.clock import Clock
+from kivy.lang import Builder
+
+import profiling
+
+Builder.load_string(
+'''
+<PerfOverlay>:
+    size_hint: None, None
+    size: self.texture_size
+    padding: 5, 5
+    font_size: '11sp'
+    color: 1, 1, 1, 1
+    canvas.before:
+        Color:
+            rgba: 0, 0, 0, 0.6
+        Rectangle:
+            pos: self.pos
+            size: self.size
+''')
+
+class PerfOverlay(Label):
+    """Petit encadré affichant, pour chaque mesure de `profiling`, la 
+    dernière durée, la durée moyenne et le nombre de points traités.
+    
+    Utilisation :
+        `overlay = PerfOverlay()
+        Window.add_widget(overlay)`
+    """
+    
+    def __init__(self, refresh_interval=0.5, **kwargs):
+        """
+        Paramètres
+        ----------
+        refresh_interval : float
+            Intervalle entre deux mises à jour de l'affichage (s).
+        """
+        super(PerfOverlay, self).__init__(**kwargs)
+        self._event = Clock.schedule_interval(self.refresh, refresh_interval)
+        self.bind(parent=self._on_parent)
+        self.refresh()
+    
+    def _on_parent(self, instance, parent):
+        if parent is None:
+            self._event.cancel()
+        else:
+            self._event()
+            self.refresh()
+    
+    def refresh(self, *args):
+        lines = []
+        for name, stat in sorted(profiling.stats().items()):
+            line = "{} : {:.1f} ms (moy. {:.1f} ms, {} appels)".format(
+                name, stat.last*1000, stat.mean*1000, stat.count)
+            if stat.points is not None:
+                line += ", {} points".format(stat.points)
+            lines.append(line)
+        self.text = "\n".join(lines) or "Aucune mesure"
+        if self.parent is not None:
+            self.top = self.parent.height
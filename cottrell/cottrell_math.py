@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import math 
+from array import array
+
+import profiling
 
 F = 96485.3329 #constante de Faraday en C.mol-1
 
@@ -72,6 +75,25 @@ def create_t(start, stop, num):
         return linspace(start, stop, num)[1:]
     return linspace(start, stop, num)
 
+def inverse_sqrt(t):
+    """Retourne le tableau des 1/√t pour les valeurs de `t`, les temps 
+    négatifs ou nuls donnant `inf`. Utilisé par la courbe théorique de 
+    Cottrell et par la régression I = f(1/√t).
+    
+    Paramètres
+    ----------
+    t : list-like
+        Valeurs de t. (s)
+    
+    Retour
+    ------
+    x : array.array
+        Valeurs de 1/√t. (s^-½)
+    """
+    return array('d', (1/math.sqrt(time) if time > 0 else math.inf 
+                       for time in t))
+
+@profiling.timed("cottrell_curve_gen", points=lambda I, *args: len(I))
 def cottrell_curve_gen(n, S, C, D, t):
     '''Crée un tableau de valeurs d'intensité selon l'équation de Cottrell : 
         `I = n × F × S × C × √(D ÷ (π × t))`
@@ -96,4 +118,4 @@ def cottrell_curve_gen(n, S, C, D, t):
     '''
     constant = n*F*S*C*math.sqrt(D/math.pi)
     
-    return[ (constant*math.sqrt(1/time)) for time in t ]
+    return [constant*x for x in inverse_sqrt(t)]
@@ -1,17 +1,52 @@
 # -*- coding: utf-8 -*-
 from backports import csv
+from array import array
 import os
+import re
 
-class _DataRow:
-    def __init__(self):
-        self.name = ""
-        self.values = []
+import profiling
+
+class DataColumn:
+    """Colonne de valeurs d'une acquisition. Les valeurs sont stockées dans 
+    un `array.array` de type `dtype` : 8 octets par valeur en double 
+    précision, au lieu d'environ 32 pour une liste de `float`.
+    """
+    __slots__ = ("name", "units", "dtype", "values")
+    
+    def __init__(self, name="", units="", dtype='d'):
+        """
+        Paramètres
+        ----------
+        name : str
+            Nom de la colonne (intitulé complet, avec les unités).
+        units : str
+            Unités des valeurs.
+        dtype : str
+            Type des valeurs, au sens du module `array`.
+        """
+        self.name = name
+        self.units = units
+        self.dtype = dtype
+        self.values = array(dtype)
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def set_name(self, name):
+        """Change le nom de la colonne et en déduit les unités, indiquées 
+        entre parenthèses ou entre crochets à la fin du nom 
+        (par exemple "Temps (s)").
+        """
+        self.name = name
+        match = re.search(r"[(\[]([^()\[\]]*)[)\]]\s*$", name)
+        self.units = match.group(1).strip() if match else ""
 
 class DataReader:
     """Classe s'occupant de lire un fichier afin d'obtenir les valeurs
     expérimentales.
     """
-    def __init__(self, filename, delimiter = ';', encoding="ISO-8859-15"):
+    def __init__(self, filename, delimiter = ';', encoding="ISO-8859-15", 
+                 store=None, key=None, dtype='d'):
         """
         Paramètres
         ----------
@@ -21,14 +56,35 @@ class DataReader:
             Caractère délimitant les cellules (pour un fichier csv).
         encoding : str
             Type d'encodage du fichier.
+        store : SharedAcquisitionStore
+            Si donné, les valeurs lues sont aussi copiées dans `store`, sous 
+            les clés "`key`/t" et "`key`/I", pour les processus de calcul. Les
+            tableaux retournés restent des `array.array` propres au processus
+            courant : aucune vue sur la mémoire partagée n'est gardée par 
+            l'interface, et le registre peut fermer ses blocs à tout moment.
+        key : str
+            Préfixe des clés dans `store`. Par défaut, `filename`.
+        dtype : str
+            Type de stockage des valeurs : 'd' (double précision) ou 'f' 
+            (simple précision, deux fois moins de mémoire, suffisant pour 
+            l'affichage).
         """
-        self.tData = _DataRow()
-        self.IData = _DataRow()
+        self.tData = DataColumn("t (s)", "s", dtype)
+        self.IData = DataColumn("I (A)", "A", dtype)
+        #Potentiel appliqué, présent seulement dans les fichiers crv
+        self.EData = DataColumn("E (V)", "V", dtype)
         
-        if os.path.splitext(filename)[1] in (".csv", ".CSV"):
-            self._csv_reader(filename)
-        elif os.path.splitext(filename)[1] in (".crv", ".CRV"):
-            self._crv_reader(filename)
+        with profiling.timer("DataReader") as timer:
+            if os.path.splitext(filename)[1] in (".csv", ".CSV"):
+                self._csv_reader(filename)
+            elif os.path.splitext(filename)[1] in (".crv", ".CRV"):
+                self._crv_reader(filename)
+            timer.points = len(self.tData.values)
+        
+        if store is not None:
+            key = filename if key is None else key
+            store.put(key + "/t", self.tData.values, dtype).release()
+            store.put(key + "/I", self.IData.values, dtype).release()
         
     def _csv_reader(self, filename):
         leave = False
@@ -39,8 +95,8 @@ class DataReader:
                     with open(filename, newline='', encoding=encoding) as csvfile:
                         self.rawData = csv.reader(csvfile, delimiter=delimiter)
                         data = list(self.rawData)
-                        self.tData.name = data[0][0]
-                        self.IData.name = data[0][1]
+                        self.tData.set_name(data[0][0])
+                        self.IData.set_name(data[0][1])
                         data = data[1:]
                         for row in data:
                             self.tData.values.append(float(row[0]))
@@ -65,6 +121,8 @@ class DataReader:
                         line = file.readline().rstrip('\n\r').split("\t")
                         self.tData.values.append(float(line[0]))
                         self.IData.values.append(float(line[1]))
+                        if len(line) > 2:
+                            self.EData.values.append(float(line[2]))
             except FileNotFoundError as err:
                 raise err
             except (OSError, ValueError) as err:
@@ -85,6 +143,9 @@ class DataReader:
     def get_t_label(self):
         return self.tData.name
     
+    def get_t_units(self):
+        return self.tData.units
+    
     def get_I(self):
         """
         Retour
@@ -95,5 +156,20 @@ class DataReader:
     
     def get_I_label(self):
         return self.IData.name
+    
+    def get_I_units(self):
+        return self.IData.units
+    
+    def get_E(self):
+        """
+        Retour
+        ------
+        Tableau de valeurs du potentiel appliqué, vide si le fichier n'en 
+        contient pas.
+        """
+        return self.EData.values
+    
+    def get_E_units(self):
+        return self.EData.units
 
     
\ No newline at end of file
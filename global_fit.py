@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""Ajustement d'un coefficient de diffusion unique sur une série
+d'acquisitions.
+
+D'après la loi de Cottrell, pour chaque acquisition k :
+    ln(I) = ln(n.F.S.C/√π) + ½.ln(D) - ½.ln(t)
+Une fois retiré le terme propre à chaque acquisition, tous les points de la
+série suivent la même droite :
+    y = ln(I) - ln(n.F.S.C/√π) = ½.ln(D) + b.ln(t)
+Les points de toutes les acquisitions sont empilés et la droite est ajustée
+en une seule fois par les moindres carrés. D est tiré de l'ordonnée à
+l'origine : D = exp(2.ordonnée).
+"""
+
+import math as m
+
+from tab_operations import TabOperations
+from linear_regression import LinearRegression, log_transform
+
+def log_offset(n, S, C):
+    """Retourne le terme ln(n.F.S.C/√π) propre à une acquisition, à
+    retrancher à ln(I).
+    """
+    return m.log(n*LinearRegression.F*S*C/m.sqrt(m.pi))
+
+class FitAcquisition:
+    """Acquisition d'une série, avec ses propres paramètres.
+    """
+    def __init__(self, t, I, n, S, C, tmin=None, tmax=None, correction=0.,
+                 label="", polarity='abs'):
+        """
+        Paramètres
+        ----------
+        t : list-like
+            Tableau de valeurs des temps expérimentaux.
+        I : list-like
+            Tableau de valeurs des intensités expérimentales.
+        n : int
+            Nombre d'électrons échangés au cours de la réaction.
+        S : float
+            Surface d'échange.
+        C : float
+            Concentration de l'espèce.
+        tmin, tmax : float or None
+            Intervalle de travail. Par défaut, toute l'acquisition.
+        correction : float
+            Valeur ajoutée à toutes les intensités.
+        label : str
+            Nom de l'acquisition (nom du fichier par exemple).
+        polarity : 'abs', 1 or -1
+            Convention de signe du courant, voir `linear_regression.log_mask`.
+        """
+        self.t = t
+        self.I = I
+        self.n = n
+        self.S = S
+        self.C = C
+        self.tmin = tmin
+        self.tmax = tmax
+        self.correction = correction
+        self.label = label
+        self.polarity = polarity
+
+    def log_values(self):
+        """Sélectionne l'intervalle, corrige I et passe au logarithme.
+
+        Retour
+        ------
+        logt : list
+            Logarithme des temps (les points qui ne peuvent pas passer au
+            logarithme sont éliminés).
+        y : list
+            ln(I) - ln(n.F.S.C/√π).
+        """
+        tmin = min(self.t) if self.tmin is None else self.tmin
+        tmax = max(self.t) if self.tmax is None else self.tmax
+        t, I = TabOperations.del_values_not_between_tmin_tmax(self.t, self.I,
+                                                              tmin, tmax)
+        I = TabOperations.add_x_to_tab(I, self.correction)
+        offset = log_offset(self.n, self.S, self.C)
+        logt, logI = log_transform(t, I, self.polarity)[:2]
+        return logt, [value - offset for value in logI]
+
+def log_statistics(logt, y):
+    """Calcule les sommes suffisantes à l'ajustement d'une droite sur les
+    points `(logt, y)`.
+
+    Retour
+    ------
+    Tuple `(nombre de points, Σx, Σy, Σx², Σxy, Σy²)`.
+    """
+    return (len(logt), m.fsum(logt), m.fsum(y), m.fsum(x*x for x in logt),
+            m.fsum(x*v for x, v in zip(logt, y)), m.fsum(v*v for v in y))
+
+class GlobalFitResult:
+    """Résultat de `fit_global_D`.
+
+    Attributs
+    ---------
+    D : float
+        Coefficient de diffusion commun à la série.
+    slope : float
+        Coefficient directeur commun (-0.5 pour une loi de Cottrell idéale).
+    intercept : float
+        Ordonnée à l'origine commune, ½.ln(D).
+    points : int
+        Nombre total de points ajustés.
+    residuals : list of float
+        Écart quadratique moyen des résidus de chaque acquisition, dans
+        l'ordre de la série.
+    """
+    def __init__(self, slope, intercept, points, residuals):
+        self.slope = slope
+        self.intercept = intercept
+        self.D = m.exp(2*intercept)
+        self.points = points
+        self.residuals = residuals
+
+def fit_global_D(acquisitions, equal_weights=False):
+    """Ajuste un coefficient de diffusion unique sur `acquisitions`.
+
+    Chaque acquisition n'est parcourue qu'une fois pour calculer ses sommes
+    (voir `log_statistics`) : la droite commune est ensuite obtenue
+    directement à partir des sommes de toutes les acquisitions.
+
+    Paramètres
+    ----------
+    acquisitions : list of FitAcquisition or list of tuple
+        Acquisitions de la série, ou leurs sommes déjà calculées par
+        `log_statistics` (par exemple dans d'autres processus).
+    equal_weights : bool
+        Si `True`, chaque acquisition a le même poids quel que soit son nombre
+        de points. Sinon, chaque point a le même poids.
+
+    Retour
+    ------
+    Un `GlobalFitResult`.
+
+    Lève une `ValueError` s'il n'y a pas assez de points.
+    """
+    statistics = [log_statistics(*acquisition.log_values())
+                  if isinstance(acquisition, FitAcquisition) else acquisition
+                  for acquisition in acquisitions]
+    weights = [1/stats[0] if equal_weights and stats[0] else 1.
+               for stats in statistics]
+
+    #Sommes pondérées sur toute la série
+    N, sx, sy, sxx, sxy = (m.fsum(w*stats[i] for w, stats in
+                                  zip(weights, statistics))
+                           for i in range(5))
+    if N == 0:
+        raise ValueError("aucun point à ajuster")
+    #Sommes centrées
+    cxx = sxx - sx*sx/N
+    cxy = sxy - sx*sy/N
+    if cxx <= 0:
+        raise ValueError("pas assez de points pour l'ajustement")
+    slope = cxy/cxx
+    intercept = (sy - slope*sx)/N
+
+    residuals = []
+    for n, sx, sy, sxx, sxy, syy in statistics:
+        if n == 0:
+            residuals.append(float('nan'))
+            continue
+        ssr = m.fsum((syy, -2*slope*sxy, -2*intercept*sy, slope*slope*sxx,
+                      2*slope*intercept*sx, intercept*intercept*n))
+        residuals.append(m.sqrt(max(ssr, 0)/n))
+    return GlobalFitResult(slope, intercept,
+                           sum(stats[0] for stats in statistics), residuals)
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+from chronocoulometry import Chronocoulometry
+
+from .regression_graph_kivy import RegressionGraph
+
+class GraphAnson(RegressionGraph, Chronocoulometry):
+    """Crée le graphique de la charge en fonction de √t (droite d'Anson).
+    """
+    title = "Droite d'Anson"
+    xlabel = '√Temps (s^½)'
+    ylabel = 'Charge (C)'
+
+    def __init__(self, n, S, C, t, I):
+        """
+        Paramètres
+        ----------
+        n : int
+            Nombre d'électrons échangés au cours de la réaction.
+        S : float
+            Surface d'échange.
+        C : float
+            Concentration de l'espèce.
+        t : list
+            Tableau de valeurs des temps expérimentaux.
+        I : list
+            Tableau de valeurs des intensités mesurées expérimentalement.
+        """
+        Chronocoulometry.__init__(self, t, I)
+        RegressionGraph.__init__(self, n, S, C)
+
+    def compute_curves(self):
+        self.charge_curves_tab(self.t, self.I)
+        slope, intercept = self.anson_fit()
+        return self.sqrtt, self.Q, slope, intercept
+
+    def calculate_Dexp(self, slope, intercept):
+        return self.calculate_D(slope, self.n, self.S, self.C)
+
+    def fit_label(self, slope, intercept):
+        return "Droite d'Anson\nD={:.4g}\nQ(0)={:.4g} C".format(
+                self.Dexp, self.adsorbed_charge(slope, intercept))
+
+    def data_label(self):
+        return "Charge expérimentale"
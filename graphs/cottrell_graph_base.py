@@ -1,4 +1,106 @@
 # -*- coding: utf-8 -*-
+from array import array
+
+from linear_regression import LinearRegression
+
+from .decimation import MinMaxDecimator
+
+#Couleurs des acquisitions superposées, utilisées tour à tour
+ACQUISITION_COLORS = ([0, 0.6, 0, 1], [1, 0.5, 0, 1], [0.6, 0, 0.8, 1],
+                      [0, 0.7, 0.7, 1], [0.5, 0.3, 0.1, 1], [1, 0, 0.6, 1])
+
+class Acquisition:
+    """Courbe expérimentale affichée sur le graphique, avec ses propres 
+    caches : points décimés pour la dernière vue et résultat de la 
+    régression linéaire.
+    """
+    __slots__ = ("t", "I", "label", "color", "tmax", "Imax", "Imin", 
+                 "diffusion", "_decimator", "_view", "_points", "_regression")
+    
+    def __init__(self, t, I, label="", color=None, diffusion=None):
+        """
+        Paramètres
+        ----------
+        t : list-like
+            Tableau de valeurs de temps, croissantes.
+        I : list-like
+            Tableau de valeurs d'intensité.
+        label : str
+            Nom de la courbe dans la légende.
+        color : list
+            Couleur de la courbe (RGBA).
+        diffusion : callable or None
+            Fonction `diffusion(n, S, C)` retournant le coefficient de 
+            diffusion de la courbe, lorsqu'il ne se déduit pas de la loi de 
+            Cottrell (retour d'un double saut de potentiel par exemple). Par
+            défaut, il est déduit de la régression linéaire.
+        """
+        self.t = t
+        self.I = I
+        self.label = label
+        self.color = color
+        self.diffusion = diffusion
+        self.tmax = max(t) if len(t) else 0
+        self.Imax = max(I) if len(I) else 0
+        self.Imin = min(I) if len(I) else 0
+        self._decimator = None
+        self._view = None
+        self._points = (t, I)
+        self._regression = None
+    
+    def points(self, tleft, tright, max_points):
+        """Retourne les points à dessiner entre `tleft` et `tright` pour une 
+        largeur d'environ `max_points` points. Le résultat est gardé en cache
+        tant que la vue ne change pas.
+        
+        Retour
+        ------
+        Tuple `(t, I)` des tableaux de points, à passer à `Plot.xy_data`. Le 
+        même tuple est retourné tant que la vue est la même.
+        """
+        #Les petites acquisitions sont dessinées entièrement, quelle que soit
+        #la vue
+        view = (tleft, tright, max_points) if len(self.t) > max_points else "all"
+        if view != self._view:
+            if view == "all":
+                self._points = (self.t, self.I)
+            else:
+                if self._decimator is None:
+                    self._decimator = MinMaxDecimator(self.t, self.I)
+                self._points = self._decimator.points(tleft, tright, max_points)
+            self._view = view
+        return self._points
+    
+    def regression(self):
+        """Calcule (une seule fois) la régression linéaire de log(I) en 
+        fonction de log(t).
+        
+        Retour
+        ------
+        `(coefficient directeur, ordonnée à l'origine)`, ou None s'il n'y a
+        pas assez de points pouvant passer au logarithme.
+        """
+        if self._regression is None:
+            regression = LinearRegression(self.t, self.I)
+            try:
+                regression.logexp_curves_tab(self.t, self.I)
+                self._regression = regression.linregress()
+            except (ValueError, ZeroDivisionError):
+                #Pas assez de points
+                self._regression = ()
+        return self._regression or None
+    
+    def D(self, n, S, C):
+        """Retourne le coefficient de diffusion déduit de la régression 
+        linéaire (ou de `diffusion`), ou None si elle n'est pas possible.
+        """
+        if self.diffusion is not None:
+            return self.diffusion(n, S, C)
+        regression = self.regression()
+        if regression is None:
+            return None
+        return LinearRegression(self.t, self.I).calculate_D(regression[1], 
+                                                            n, S, C)
 
 class CottrellGraphBase:
     """Classe mère permettant d'avoir une base commune pour
@@ -13,10 +115,20 @@ class CottrellGraphBase:
         self.C=10**-3
         self.D=10**-5
 
-        self.expt=[]
-        self.expI=[]
+        self.expt=array('d')
+        self.expI=array('d')
+        self._experimental = Acquisition(self.expt, self.expI)
 
         self.expD = None
+        
+        #Acquisitions superposées à la courbe expérimentale
+        self.acquisitions = {}
+        self._next_acquisition_key = 0
+        self._acquisitions_changed = False
+
+        #Indique si les données théoriques ont changé depuis le dernier 
+        #affichage
+        self._theoric_changed = True
 
         self._display_theoric=True
         self._display_experimental=False
@@ -57,6 +169,7 @@ class CottrellGraphBase:
     def set_theoric_data (self, t, I):
         self.t=t
         self.I=I
+        self._theoric_changed = True
     def get_theoric_data(self):
         return self.t, self.I
         
@@ -71,6 +184,44 @@ class CottrellGraphBase:
     def set_experimental_data(self, expt, expI):
         self.expt=expt
         self.expI=expI
+        self._experimental = Acquisition(expt, expI)
+        
+    def add_acquisition(self, t, I, label="", color=None, diffusion=None):
+        """Ajoute une acquisition à superposer à la courbe expérimentale.
+        
+        Paramètres
+        ----------
+        t : list-like
+            Tableau de valeurs de temps, croissantes.
+        I : list-like
+            Tableau de valeurs d'intensité.
+        label : str
+            Nom de la courbe dans la légende.
+        color : list
+            Couleur de la courbe (RGBA). Par défaut, une couleur de 
+            `ACQUISITION_COLORS`.
+        diffusion : callable or None
+            Voir `Acquisition`.
+        
+        Retour
+        ------
+        Clé de l'acquisition, à passer à `remove_acquisition`.
+        """
+        key = self._next_acquisition_key
+        self._next_acquisition_key += 1
+        if color is None:
+            color = ACQUISITION_COLORS[key % len(ACQUISITION_COLORS)]
+        self.acquisitions[key] = Acquisition(t, I, label, color, diffusion)
+        self._acquisitions_changed = True
+        return key
+    
+    def remove_acquisition(self, key):
+        del self.acquisitions[key]
+        self._acquisitions_changed = True
+    
+    def clear_acquisitions(self):
+        self.acquisitions.clear()
+        self._acquisitions_changed = True
         
     def set_limit_interval(self, tleft=None, tright=None, Ibottom=None, Itop=None):
         """Sélectionne la zone que l'on veut afficher. Par défaut l'ensemble 
@@ -97,13 +248,21 @@ class CottrellGraphBase:
                 tright = max(self.expt) if self._display_experimental else max(self.t)
             else:
                 tright = max(self.expt) if self._display_experimental else 5
+            #Les acquisitions superposées sont toujours affichées
+            tright = max([tright] + [acquisition.tmax for acquisition in 
+                                     self.acquisitions.values()])
         if Ibottom == None:
-            Ibottom = 0
+            #Les acquisitions superposées peuvent avoir des courants négatifs
+            #(retour d'un double saut de potentiel)
+            Ibottom = min([0] + [acquisition.Imin for acquisition in 
+                                 self.acquisitions.values()])
         if Itop == None:
             if self._display_theoric:
                 Itop = max(self.expI) if self._display_experimental else max(self.I)
             else:
                 Itop = max(self.expI) if self._display_experimental else 1
+            Itop = max([Itop] + [acquisition.Imax for acquisition in 
+                                 self.acquisitions.values()])
         
         self.tleft=tleft
         self.tright=tright
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from kivy.app import App
-from kivy.garden.graph import Graph, SmoothLinePlot
+from kivy.garden.graph import Graph, SmoothLinePlot, nice_tick_spacing
 from kivy.event import EventDispatcher
 from kivy.properties import BooleanProperty
 from kivy.utils import get_color_from_hex
@@ -54,9 +54,13 @@ class CottrellGraph(CottrellGraphBase, EventDispatcher):
                            ymax=float(self.Itop),
                            legend=self.legend,
                            precision="%#.4g",
+                           align_ticks=True,
                            **graph_theme)
         
-        self.thplot = SmoothLinePlot(color=[0, 0, 1, 1])
+        #Les points sont projetés par le GPU : un zoom ne renvoie pas les 
+        #données. Les courbes expérimentales sont décimées à chaque zoom, 
+        #elles sont donc projetées par le CPU.
+        self.thplot = SmoothLinePlot(color=[0, 0, 1, 1], gpu_transform=True)
         self.thplot.label = "Théorique"
         
         self.expplot = SmoothLinePlot(color=[1, 0, 0, 1])
@@ -66,9 +70,17 @@ class CottrellGraph(CottrellGraphBase, EventDispatcher):
         self.bind(ticks_labels=self.graph.setter('y_grid_label'))
         self.bind(ticks_labels=self.graph.setter('x_grid_label'))
         
+        #Courbes des acquisitions superposées, par clé d'acquisition
+        self._acquisition_plots = {}
+        #Derniers points envoyés à chaque courbe expérimentale
+        self._plotted_points = {}
+        
         self._trigger = Clock.create_trigger(self.update_ticks)
         self.graph.bind(size=self._trigger)
         self.graph._plot_area.bind(pos=self._trigger)
+        #Le nombre de points dessinés dépend de la largeur du graphique
+        self._trigger_points = Clock.create_trigger(self.update_experimental_points)
+        self.graph.bind(width=self._trigger_points)
         
         #self._update_ticks_counts = 0 # Pour éviter un clignotement
         #with self.graph.canvas:
@@ -78,21 +90,26 @@ class CottrellGraph(CottrellGraphBase, EventDispatcher):
         """Met à jour le graphique en redessinant les courbes.
         """
         if self._display_theoric:
-            self.thplot.points = list(zip(self.t,self.I))
+            #On ne renvoie les points que s'ils ont changé
+            if self._theoric_changed:
+                self.thplot.xy_data = (self.t, self.I)
+                self._theoric_changed = False
             if self.thplot not in self.graph.plots:
                 self.graph.add_plot(self.thplot)
         else:
             if self.thplot in self.graph.plots:
                 self.graph.remove_plot(self.thplot)
                 
-        if self._display_experimental:                
-            self.expplot.points = list(zip(self.expt,self.expI))
-            
+        if self._display_experimental:
             if self.expplot not in self.graph.plots:
                 self.graph.add_plot(self.expplot)
         else:
             if self.expplot in self.graph.plots:
                 self.graph.remove_plot(self.expplot)
+        
+        if self._acquisitions_changed:
+            self._update_acquisition_plots()
+        self._update_acquisition_labels()
                 
         self.graph.xmin = float(self.tleft)
         self.graph.xmax = float(self.tright)
@@ -100,16 +117,67 @@ class CottrellGraph(CottrellGraphBase, EventDispatcher):
         self.graph.ymin = float(self.Ibottom)
         self.graph.ymax = float(self.Itop) if self.Ibottom!=self.Itop else 1.0
         
+        self.update_experimental_points()
         self.update_ticks()
     
+    def _update_acquisition_plots(self):
+        """Crée ou supprime les courbes des acquisitions superposées.
+        """
+        for key in list(self._acquisition_plots):
+            if key not in self.acquisitions:
+                plot = self._acquisition_plots.pop(key)
+                self._plotted_points.pop(plot, None)
+                self.graph.remove_plot(plot)
+        for key, acquisition in self.acquisitions.items():
+            if key not in self._acquisition_plots:
+                plot = SmoothLinePlot(color=acquisition.color)
+                plot.label = acquisition.label
+                self._acquisition_plots[key] = plot
+                self.graph.add_plot(plot)
+        self._acquisitions_changed = False
+    
+    def _update_acquisition_labels(self):
+        """Affiche dans la légende le coefficient de diffusion de chaque 
+        acquisition superposée, calculé avec les valeurs actuelles de n, S et
+        C.
+        """
+        changed = False
+        for key, plot in self._acquisition_plots.items():
+            acquisition = self.acquisitions[key]
+            D = acquisition.D(self.n, self.S, self.C)
+            label = acquisition.label if D is None else \
+                "{}\nD={:.4g}".format(acquisition.label, D)
+            if plot.label != label:
+                plot.label = label
+                changed = True
+        if changed:
+            self.graph._trigger_legend()
+    
+    def update_experimental_points(self, *args):
+        """Envoie aux courbes expérimentales les points visibles, décimés à 
+        environ deux points par pixel : le coût du dessin dépend de la taille
+        du graphique et non du nombre de points des acquisitions.
+        """
+        max_points = 2*max(int(self.graph.get_plot_area_size()[0]), 1)
+        curves = [(self._experimental, self.expplot)] if self._display_experimental else []
+        curves += [(self.acquisitions[key], plot) for key, plot in 
+                   self._acquisition_plots.items()]
+        for acquisition, plot in curves:
+            points = acquisition.points(self.tleft, self.tright, max_points)
+            #On ne renvoie les points que s'ils ont changé
+            if points is not self._plotted_points.get(plot):
+                plot.xy_data = points
+                self._plotted_points[plot] = points
+    
     def update_ticks(self, *args):
         """Met à jour l'échelle.
         """
         width, height = self.graph.get_plot_area_size()
-        self.graph.x_ticks_major = (self.graph.xmax-self.graph.xmin)/(width/100)
-        self.graph.x_ticks_minor = 10
-        self.graph.y_ticks_major = (self.graph.ymax-self.graph.ymin)/(height/50)
-        self.graph.y_ticks_minor = 5
+        #Environ une graduation tous les 100 pixels en x et 50 pixels en y
+        self.graph.x_ticks_major, self.graph.x_ticks_minor = nice_tick_spacing(
+                self.graph.xmin, self.graph.xmax, width/100)
+        self.graph.y_ticks_major, self.graph.y_ticks_minor = nice_tick_spacing(
+                self.graph.ymin, self.graph.ymax, height/50)
     
     def update_colors(self, *args):
         theme_cls = App.get_running_app().theme_cls
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Réduction du nombre de points à dessiner pour les grandes acquisitions.
+
+Dessiner plus de deux points par pixel n'apporte rien. `MinMaxDecimator`
+construit une pyramide de paquets de points dont il garde, pour chaque
+paquet, les indices du minimum et du maximum de y. Pour une fenêtre
+d'affichage donnée, il renvoie ces extrema pour des paquets d'environ un
+pixel : le tracé obtenu a la même allure que la courbe complète (les pics
+sont conservés), pour un coût proportionnel à la largeur du graphique et non
+au nombre de points.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import le, ge
+
+def _pick_pairs(first, second, keep_first):
+    """Choisit, pour chaque paire `(first[k], second[k])` d'indices, le
+    premier si `keep_first[k]` est vrai et le second sinon. Un indice de
+    `first` sans partenaire (nombre impair d'indices) est gardé.
+    """
+    picked = array('l', [a if keep else b
+                         for a, b, keep in zip(first, second, keep_first)])
+    if len(first) > len(second):
+        picked.append(first[-1])
+    return picked
+
+class MinMaxDecimator:
+    """Pyramide min/max sur une courbe `y(x)` dont les abscisses sont
+    croissantes.
+    """
+    #Facteur de taille entre deux niveaux de la pyramide : les paquets d'un
+    #niveau regroupent ceux du précédent deux à deux, de sorte qu'une vue
+    #puisse toujours être rendue avec entre la moitié et la totalité des
+    #points demandés
+    FACTOR = 2
+
+    def __init__(self, x, y):
+        """
+        Paramètres
+        ----------
+        x : list-like
+            Abscisses, croissantes.
+        y : list-like
+            Ordonnées.
+        """
+        self.x = x
+        self.y = y
+        #Liste de (taille des paquets, indices des minima, indices des maxima)
+        self.levels = []
+        self._build()
+
+    def _build(self):
+        y = self.y
+        n = len(y)
+        if not n:
+            return
+        #Premier niveau, calculé sur les points eux-mêmes. En cas d'égalité, 
+        #le premier indice est gardé, comme avec `min` et `max`.
+        first = range(0, n, 2)
+        second = range(1, n, 2)
+        yfirst, ysecond = y[0::2], y[1::2]
+        imins = _pick_pairs(first, second, map(le, yfirst, ysecond))
+        imaxs = _pick_pairs(first, second, map(ge, yfirst, ysecond))
+        size = 2
+        #Niveaux suivants, calculés sur les extrema du niveau précédent
+        getitem = y.__getitem__
+        while len(imins) > 1:
+            self.levels.append((size, imins, imaxs))
+            mins1, mins2 = imins[0::2], imins[1::2]
+            maxs1, maxs2 = imaxs[0::2], imaxs[1::2]
+            imins = _pick_pairs(mins1, mins2, map(le, map(getitem, mins1),
+                                                  map(getitem, mins2)))
+            imaxs = _pick_pairs(maxs1, maxs2, map(ge, map(getitem, maxs1),
+                                                  map(getitem, maxs2)))
+            size *= 2
+        self.levels.append((size, imins, imaxs))
+
+    def points(self, xmin, xmax, max_points):
+        """Retourne au plus environ `max_points` points de la courbe entre
+        `xmin` et `xmax`, plus un point de chaque côté pour que la courbe
+        rejoigne les bords.
+
+        Retour
+        ------
+        Tuple `(x, y)` des abscisses et des ordonnées.
+        """
+        x, y = self.x, self.y
+        n = len(x)
+        first = max(bisect_left(x, xmin) - 1, 0)
+        last = min(bisect_right(x, xmax) + 1, n)
+        if last - first <= max_points or not self.levels:
+            return x[first:last], y[first:last]
+
+        #Plus petit niveau donnant au plus `max_points` points (2 par paquet)
+        for size, imins, imaxs in self.levels:
+            if 2*(last - first)/size <= max_points:
+                break
+        indices = [first]
+        for bucket in range(first//size, (last - 1)//size + 1):
+            imin, imax = imins[bucket], imaxs[bucket]
+            if imin > imax:
+                imin, imax = imax, imin
+            if first < imin < last - 1:
+                indices.append(imin)
+            if imax != imin and first < imax < last - 1:
+                indices.append(imax)
+        indices.append(last - 1)
+        return [x[i] for i in indices], [y[i] for i in indices]
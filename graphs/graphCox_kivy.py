@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from kivy.app import App
-from kivy.garden.graph import Graph ,SmoothLinePlot
+from kivy.garden.graph import Graph ,SmoothLinePlot, nice_tick_spacing
 from kivy.clock import Clock
 from kivy.utils import get_color_from_hex
 
@@ -61,6 +61,7 @@ class CoxGraph():
                            ymin=float(0),
                            ymax=float(1),
                            precision="%#.4g",
+                           align_ticks=True,
                            **graph_theme)
         
         self.coxplot = SmoothLinePlot(color=[0, 0, 1, 1])
@@ -74,7 +75,7 @@ class CoxGraph():
     def update(self, *args): 
         """Met à jour l'affichage.
         """
-        self.coxplot.points = list(zip(self.x,self.cox))
+        self.coxplot.xy_data = (self.x, self.cox)
 
         self.graph.xmin = min(self.x)
         self.graph.xmax = max(self.x)
@@ -85,10 +86,11 @@ class CoxGraph():
         """Met à jour l'échelle.
         """
         width, height = self.graph.get_plot_area_size()
-        self.graph.x_ticks_major = (self.graph.xmax-self.graph.xmin)/(width/100)
-        self.graph.x_ticks_minor = 10
-        self.graph.y_ticks_major = (self.graph.ymax-self.graph.ymin)/(height/50)
-        self.graph.y_ticks_minor = 5
+        #Environ une graduation tous les 100 pixels en x et 50 pixels en y
+        self.graph.x_ticks_major, self.graph.x_ticks_minor = nice_tick_spacing(
+                self.graph.xmin, self.graph.xmax, width/100)
+        self.graph.y_ticks_major, self.graph.y_ticks_minor = nice_tick_spacing(
+                self.graph.ymin, self.graph.ymax, height/50)
         
     def get_canvas(self):
         return (self.graph)
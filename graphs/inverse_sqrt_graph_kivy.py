@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+from inverse_sqrt_regression import InverseSqrtRegression
+
+from .regression_graph_kivy import RegressionGraph
+
+class GraphInverseSqrt(RegressionGraph, InverseSqrtRegression):
+    """Crée le graphique de l'intensité en fonction de 1/√t (droite de 
+    Cottrell).
+    """
+    title = "Droite de Cottrell"
+    xlabel = '1/√Temps (s^-½)'
+    ylabel = 'Intensité (A)'
+
+    def __init__(self, n, S, C, t, I):
+        """
+        Paramètres
+        ----------
+        n : int
+            Nombre d'électrons échangés au cours de la réaction.
+        S : float
+            Surface d'échange.
+        C : float
+            Concentration de l'espèce.
+        t : list
+            Tableau de valeurs des temps expérimentaux.
+        I : list
+            Tableau de valeurs des intensités mesurées expérimentalement.
+        """
+        InverseSqrtRegression.__init__(self, t, I)
+        RegressionGraph.__init__(self, n, S, C)
+
+    def compute_curves(self):
+        self.inverse_sqrt_curves_tab(self.t, self.I)
+        slope, intercept = self.inverse_sqrt_fit()
+        return self.invsqrtt, self.curI, slope, intercept
+
+    def calculate_Dexp(self, slope, intercept):
+        return self.calculate_D(slope, self.n, self.S, self.C)
+
+    def fit_label(self, slope, intercept):
+        return "Droite de Cottrell\nD={:.4g}\nI(∞)={:.4g} A".format(
+                self.Dexp, intercept)
+
+    def x_range(self, x):
+        #Les temps croissants donnent des 1/√t décroissants
+        return x[-1], x[0]
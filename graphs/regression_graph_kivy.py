@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+from kivy.app import App
+from kivy.garden.graph import (Graph, SmoothLinePlot, AnalyticLinePlot,
+                                nice_tick_spacing)
+from kivy.clock import Clock
+from kivy.utils import get_color_from_hex
+
+from kivymd.color_definitions import colors
+
+class RegressionGraph:
+    """Base des graphiques d'analyse : courbe expérimentale linéarisée et
+    droite ajustée, à partir desquelles le coefficient de diffusion est
+    calculé.
+
+    Les classes filles héritent aussi de la classe de calcul du mode
+    d'analyse, donnent les titres `title`, `xlabel` et `ylabel` et 
+    définissent :
+    
+    `compute_curves()`
+        Calcule la courbe linéarisée de `self.t` et `self.I` et ajuste la
+        droite. Retourne `(x, y, slope, intercept)` : les points de la courbe
+        à afficher, le coefficient directeur et l'ordonnée à l'origine.
+    `calculate_Dexp(slope, intercept)`
+        Retourne le coefficient de diffusion déduit de la droite.
+    `fit_label(slope, intercept)`
+        Retourne le texte de la légende de la droite, `self.Dexp` étant à
+        jour.
+    
+    `data_label()` et `x_range(x)` peuvent aussi être redéfinies.
+    """
+    title = ""
+    xlabel = ""
+    ylabel = ""
+
+    def __init__(self, n, S, C):
+        """
+        Paramètres
+        ----------
+        n : int
+            Nombre d'électrons échangés au cours de la réaction.
+        S : float
+            Surface d'échange.
+        C : float
+            Concentration de l'espèce.
+        """
+        self.n=n
+        self.S=S
+        self.C=C
+
+        graph_theme = {
+            'label_options': {
+                'color': [0, 0, 0, 1],  # color of tick labels and titles
+                'bold': False},
+            'background_color': [1, 1, 1, 1],  # back ground color of canvas
+            'tick_color': [0, 0, 0, 1],  # ticks and grid
+            'border_color': [0, 0, 0, 1]}  # border drawn around each graph
+
+        self.graph = Graph(title = self.title,
+           xlabel=self.xlabel,
+           ylabel=self.ylabel,
+           x_ticks_minor=5,
+           x_ticks_major=5,
+           y_ticks_major=0.2,
+           y_ticks_minor=4,
+           y_grid_label=True,
+           x_grid_label=True,
+           padding=5,
+           x_grid=False,
+           y_grid=False,
+           precision="%#.4g",
+           align_ticks=True,
+           **graph_theme)
+
+        self.dataplot = SmoothLinePlot(color=[1, 0, 0, 1])
+
+        #Droite ajustée, tracée d'un bord à l'autre du graphique
+        self.fitplot = AnalyticLinePlot(color=[1, 0, 1, 1])
+
+        self.graph.legend = True
+
+        self.graph.add_plot(self.dataplot)
+        self.graph.add_plot(self.fitplot)
+
+        #Tableaux utilisés lors du dernier calcul des courbes
+        self._plotted_t = None
+        self._plotted_I = None
+
+        self._trigger = Clock.create_trigger(self.update_ticks)
+        self.graph._plot_area.bind(pos=self._trigger)
+
+    def data_label(self):
+        """Retourne le texte de la légende de la courbe expérimentale.
+        """
+        return "Expérimentale"
+
+    def x_range(self, x):
+        """Retourne l'étendue `(xmin, xmax)` de l'axe des abscisses pour les
+        points `x`.
+        """
+        return min(x), max(x)
+
+    def update(self, *args):
+        """Met à jour l'affichage des courbes et le calcul du coefficient de
+        diffusion expérimental.
+        """
+        #Si seuls n, S ou C ont changé, les courbes restent les mêmes et
+        #seul D est recalculé
+        data_changed = self.t is not self._plotted_t or self.I is not self._plotted_I
+        if data_changed:
+            x, y, self._slope, self._intercept = self.compute_curves()
+            self._plotted_t = self.t
+            self._plotted_I = self.I
+        self.Dexp=self.calculate_Dexp(self._slope, self._intercept)
+
+        self.fitplot.label = self.fit_label(self._slope, self._intercept)
+
+        if not data_changed:
+            return
+
+        self.dataplot.label = self.data_label()
+        self.dataplot.xy_data = (x, y)
+        self.fitplot.slope = self._slope
+        self.fitplot.intercept = self._intercept
+
+        xmin, xmax = self.x_range(x)
+        self.graph.xmin=float(xmin)
+        self.graph.xmax=float(xmax)
+        self.graph.ymin=float(min(y))
+        self.graph.ymax=float(max(y))
+        if self.graph.ymin == self.graph.ymax:
+            self.graph.ymax = self.graph.ymin + 1.
+
+        self.update_ticks()
+
+    def update_ticks(self, *args):
+        """Met à jour l'échelle.
+        """
+        width, height = self.graph.get_plot_area_size()
+        #Environ une graduation tous les 100 pixels en x et 50 pixels en y
+        self.graph.x_ticks_major, self.graph.x_ticks_minor = nice_tick_spacing(
+                self.graph.xmin, self.graph.xmax, width/100)
+        self.graph.y_ticks_major, self.graph.y_ticks_minor = nice_tick_spacing(
+                self.graph.ymin, self.graph.ymax, height/50)
+
+    def update_colors(self, *args):
+        theme_cls = App.get_running_app().theme_cls
+        self.graph.label_options['color'] = get_color_from_hex(colors[theme_cls.primary_palette][theme_cls.primary_hue])
+        self.graph.background_color = get_color_from_hex(colors[theme_cls.theme_style]["Background"])
+        self.graph.tick_color = get_color_from_hex(colors[theme_cls.accent_palette][theme_cls.accent_hue])
+        self.graph.border_color = get_color_from_hex(colors[theme_cls.accent_palette][theme_cls.accent_hue])
+
+    def get_canvas(self):
+        return self.graph
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Régression linéaire du courant en fonction de 1/√t (droite de Cottrell).
+
+La loi de Cottrell, à laquelle s'ajoute un courant résiduel constant I∞,
+    I = n.F.S.C.√(D/π).(1/√t) + I∞
+est une droite en fonction de x = 1/√t : D se déduit directement du
+coefficient directeur a, D = π.(a/(n.F.S.C))², et l'ordonnée à l'origine est
+le décalage du courant I∞ (courant résiduel ou erreur de zéro de l'appareil).
+
+Les 1/√t sont calculés une seule fois par tableau de temps, par
+`cottrell_math.inverse_sqrt` comme pour la courbe théorique, et gardés tant
+que les valeurs expérimentales ne changent pas.
+"""
+
+import math as m
+
+from cottrell.cottrell_math import F, inverse_sqrt
+from linear_regression import linear_fit
+
+class InverseSqrtRegression:
+    """Permet d'effectuer la régression linéaire du courant en fonction de
+    1/√t sur les valeurs expérimentales.
+    """
+
+    def __init__(self, t, I):
+        """
+        Paramètres
+        ----------
+        t : list
+            Tableau de valeurs des temps expérimentaux, depuis le saut de
+            potentiel.
+        I : list
+            Tableau de valeurs des intensités mesurées expérimentalement.
+        """
+        self.t=t
+        self.I=I
+        self.Dexp=0
+        #Tableau de temps et ses 1/√t, lors du dernier calcul
+        self._inverse_sqrt = (None, None)
+
+    F = F  #Constante de Faraday
+
+    def inverse_sqrt_curves_tab(self, expt, expI):
+        """Calcule les listes de 1/√t et de I pour les points utilisables
+        (t > 0).
+
+        Paramètres
+        ----------
+        expt : list
+            Tableau de valeurs des temps expérimentaux.
+        expI : list
+            Tableau de valeurs des intensités expérimentales.
+        """
+        if self._inverse_sqrt[0] is not expt:
+            #Les tableaux de temps ne sont jamais modifiés en place (voir
+            #`TabOperations`)
+            self._inverse_sqrt = (expt, inverse_sqrt(expt))
+        x = self._inverse_sqrt[1]
+        #Les temps sont croissants : le point t = 0 (et les éventuels temps
+        #négatifs), pour lesquels 1/√t vaut inf, sont au début
+        start = next((k for k, value in enumerate(x) if not m.isinf(value)),
+                     len(x))
+        if start:
+            x = x[start:]
+            expI = expI[start:]
+        self.invsqrtt = x
+        self.curI = expI
+
+    def inverse_sqrt_fit(self):
+        """Ajuste la droite I = a/√t + b par les moindres carrés.
+
+        Retour
+        ------
+        slope : float
+            Coefficient directeur a.
+        intercept : float
+            Ordonnée à l'origine b, décalage du courant.
+        """
+        return linear_fit(self.invsqrtt, self.curI)
+
+    def calculate_D(self, slope, n, S, C):
+        """Calcule le coefficient de diffusion D à partir du coefficient
+        directeur `slope` de la droite I = f(1/√t).
+
+        Paramètres
+        ----------
+        slope : float
+            Coefficient directeur de la droite.
+        n : int
+            Nombre d'électrons échangés au cours de la réaction.
+        S : float
+            Surface d'échange.
+        C : float
+            Concentration de l'espèce.
+
+        Retour
+        ------
+        D : float
+            Coefficient de diffusion retrouvé expérimentalement
+        """
+        D = m.pi*(slope/(n*self.F*S*C))**2
+        self.Dexp=D
+        return D
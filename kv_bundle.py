@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Regroupe les fichiers kv d'un thème en un seul fichier (« bundle »).
+
+Au lieu de lire et d'analyser un fichier kv par composant à chaque 
+démarrage, l'application charge un unique fichier par thème, débarrassé des
+commentaires et des lignes vides, dont les directives (`#:kivy`, 
+`#:import`...) sont regroupées et dédoublonnées. Le bundle garde en première
+ligne la taille et la date de modification de chaque fichier source : il est
+reconstruit dès que l'un d'eux change.
+
+Les bundles peuvent être construits à l'avance (par exemple avant 
+`buildozer android debug`) avec :
+    `python kv_bundle.py`
+"""
+
+import json
+import os
+
+#Fichiers kv chargés au démarrage. `{}` est remplacé par le nom du thème.
+KV_FILES = ("app-{}.kv",
+            "components/entrypopup-{}.kv",
+            "components/errorpopup-{}.kv",
+            "components/intervalbox-{}.kv",
+            "components/interval_popup-{}.kv",
+            "components/spinbox-{}.kv")
+
+THEMES = ("default", "material-design")
+
+#Dossier des bundles construits à l'avance, relatif à la racine du projet
+BUNDLE_DIR = "kv_bundles"
+
+_SIGNATURE_PREFIX = "# sources: "
+
+def theme_sources(theme, paths=KV_FILES, root=""):
+    """Retourne les fichiers sources d'un thème. Si le fichier d'un thème 
+    n'existe pas, celui du thème "default" est utilisé.
+    
+    Paramètres
+    ----------
+    theme : str
+        Nom du thème.
+    paths : list of str
+        Chemins des fichiers, de la forme "composant-{}.kv".
+    root : str
+        Dossier auquel les chemins sont relatifs.
+    """
+    sources = []
+    for path in paths:
+        source = os.path.join(root, path.format(theme))
+        if not os.path.exists(source):
+            source = os.path.join(root, path.format("default"))
+        sources.append(source)
+    return sources
+
+def signature(sources):
+    """Retourne la signature (taille et date de modification) des fichiers 
+    `sources`.
+    """
+    return [[os.path.basename(source), os.path.getsize(source), 
+             os.path.getmtime(source)] for source in sources]
+
+def bundle_filename(theme, directory):
+    return os.path.join(directory, "bundle-{}.kv".format(theme))
+
+def is_up_to_date(bundle, sources):
+    """Indique si `bundle` existe et a été construit à partir des versions 
+    actuelles de `sources`.
+    """
+    try:
+        with open(bundle, encoding="UTF-8") as file:
+            first_line = file.readline()
+    except OSError:
+        return False
+    if not first_line.startswith(_SIGNATURE_PREFIX):
+        return False
+    try:
+        return (json.loads(first_line[len(_SIGNATURE_PREFIX):]) == 
+                json.loads(json.dumps(signature(sources))))
+    except (OSError, ValueError):
+        return False
+
+def merge(sources):
+    """Fusionne le contenu des fichiers kv `sources`.
+    
+    Retour
+    ------
+    Le contenu du bundle, sans sa ligne de signature.
+    """
+    directives = []
+    rules = []
+    for source in sources:
+        with open(source, encoding="UTF-8") as file:
+            for line in file:
+                line = line.rstrip()
+                stripped = line.lstrip()
+                if stripped.startswith("#:"):
+                    directive = "#:" + stripped[2:].strip()
+                    if directive not in directives:
+                        directives.append(directive)
+                elif stripped and not stripped.startswith("#"):
+                    rules.append(line)
+    return "\n".join(directives + rules) + "\n"
+
+def build_bundle(theme, directory, paths=KV_FILES, root=""):
+    """Construit le bundle du thème `theme` dans le dossier `directory`.
+    
+    Retour
+    ------
+    Le nom du fichier créé.
+    """
+    sources = theme_sources(theme, paths, root)
+    content = merge(sources)
+    bundle = bundle_filename(theme, directory)
+    os.makedirs(directory, exist_ok=True)
+    #Écriture dans un fichier temporaire pour ne jamais laisser un bundle
+    #incomplet
+    with open(bundle + ".tmp", 'w', encoding="UTF-8") as file:
+        file.write(_SIGNATURE_PREFIX + json.dumps(signature(sources)) + "\n")
+        file.write(content)
+    os.replace(bundle + ".tmp", bundle)
+    return bundle
+
+def get_bundle(theme, cache_dir, paths=KV_FILES, root=""):
+    """Retourne un bundle à jour pour le thème `theme` : celui construit à 
+    l'avance dans `BUNDLE_DIR` s'il est à jour, sinon celui du dossier de cache
+    `cache_dir`, reconstruit si nécessaire.
+    """
+    sources = theme_sources(theme, paths, root)
+    for directory in (os.path.join(root, BUNDLE_DIR), cache_dir):
+        bundle = bundle_filename(theme, directory)
+        if is_up_to_date(bundle, sources):
+            return bundle
+    return build_bundle(theme, cache_dir, paths, root)
+
+if __name__ == '__main__':
+    root = os.path.dirname(os.path.abspath(__file__))
+    for theme in THEMES:
+        print(build_bundle(theme, os.path.join(root, BUNDLE_DIR), root=root))
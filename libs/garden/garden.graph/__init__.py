@@ -53,7 +53,7 @@ The current availables plots are:
 
 '''
 
-__all__ = ('Graph', 'Plot', 'MeshLinePlot', 'MeshStemPlot', 'LinePlot', 'SmoothLinePlot', 'ContourPlot', 'BarPlot', 'DotPlot')
+__all__ = ('Graph', 'Plot', 'MeshLinePlot', 'MeshStemPlot', 'LinePlot', 'SmoothLinePlot', 'AnalyticLinePlot', 'ContourPlot', 'BarPlot', 'DotPlot', 'nice_tick_spacing')
 __version__ = '0.4.1-dev'
 
 from kivy.uix.widget import Widget
@@ -65,6 +65,7 @@ from kivy.properties import NumericProperty, BooleanProperty,\
     DictProperty, AliasProperty, OptionProperty
 from kivy.clock import Clock
 from kivy.graphics import Mesh, Color, Rectangle, Point, RoundedRectangle
+from kivy.graphics import InstructionGroup
 from kivy.graphics import Fbo
 from kivy.graphics.texture import Texture
 from kivy.event import EventDispatcher
@@ -73,12 +74,111 @@ from kivy.logger import Logger
 from kivy import metrics
 from math import log10, floor, ceil
 from decimal import Decimal
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
 try:
     import numpy as np
 except ImportError as e:
     np = None
 
 
+def _interleave(x, y, n=None):
+    '''Return [x0, y0, x1, y1, ...] from the sequences `x` and `y`, as a
+    numpy array if numpy is available, a list otherwise. `x` or `y` may also
+    be a number, repeated for every point; `n` is then the number of points
+    if both are.
+    '''
+    if n is None:
+        n = min(len(v) for v in (x, y) if not isinstance(v, (int, float)))
+    if np is not None:
+        flat = np.empty(2 * n)
+    else:
+        flat = [0.] * (2 * n)
+    for offset, values in ((0, x), (1, y)):
+        if isinstance(values, (int, float)):
+            values = values if np is not None else [values] * n
+        else:
+            values = values[:n]
+        flat[offset::2] = values
+    return flat
+
+
+def interleave(x, y):
+    '''Return the flat list [x0, y0, x1, y1, ...] from the sequences `x` and
+    `y`, e.g. for :attr:`kivy.graphics.Line.points`.
+    '''
+    flat = _interleave(x, y)
+    return flat.tolist() if np is not None else flat
+
+
+def _write_column(buf, offset, stride, n, values):
+    '''Write the `n` `values` (a sequence or a number) into the float buffer
+    `buf` at `offset`, `offset + stride`, ... Strided numpy writes if numpy is
+    available, extended slice assignment of an `array('f')` otherwise.
+    '''
+    if n == 0:
+        return
+    index = slice(offset, offset + stride * (n - 1) + 1, stride)
+    if np is None:
+        if isinstance(values, (int, float)):
+            values = array('f', [values]) * n
+        elif not isinstance(values, array) or values.typecode != 'f':
+            values = array('f', values)
+    buf[index] = values
+
+
+class _VertexBuffer(object):
+    '''Reusable buffers for the (x, y, u, v) vertices and the indices of a
+    :class:`~kivy.graphics.Mesh`. They grow geometrically and are never
+    shrunk, so that redrawing a similar number of points does not allocate.
+    The buffers are float32 numpy arrays if numpy is available, `array('f')`
+    otherwise; the indices are unsigned shorts, like the ones of the mesh.
+    '''
+
+    def __init__(self):
+        self._vertices = self._new_vertices(0)
+        self._indices = array('H')
+
+    @staticmethod
+    def _new_vertices(size):
+        if np is not None:
+            return np.zeros(size, dtype=np.float32)
+        return array('f', bytes(4 * size))
+
+    def vertices(self, n):
+        '''Return a buffer of at least `4 * n` floats, to write the x and y
+        of `n` vertices (offsets 0 and 1 of each group of 4).
+        '''
+        if len(self._vertices) < 4 * n:
+            # a new buffer, as the mesh may still hold a view on the old one
+            self._vertices = self._new_vertices(4 * max(n, 2 * len(self._vertices) // 4))
+        return self._vertices
+
+    def view(self, n):
+        '''Return the first `n` vertices of the buffer, for
+        :attr:`~kivy.graphics.Mesh.vertices`.
+        '''
+        if np is not None:
+            return self._vertices[:4 * n]
+        return memoryview(self._vertices)[:4 * n]
+
+    def indices(self, n):
+        '''Return the indices 0, 1, ..., n - 1, for
+        :attr:`~kivy.graphics.Mesh.indices`. A mesh has at most 65536
+        vertices: callers must split larger meshes (see
+        :meth:`MeshLinePlot.set_vertices`), a `ValueError` is raised
+        otherwise.
+        '''
+        if n > 65536:
+            raise ValueError(
+                'a mesh cannot index more than 65536 vertices, got %d' % n)
+        if len(self._indices) < n:
+            self._indices = array('H', range(min(max(n, 2 * len(self._indices)),
+                                                 65536)))
+        return memoryview(self._indices)[:n]
+
+
 def identity(x):
     return x
 
@@ -87,6 +187,124 @@ def exp10(x):
     return 10 ** x
 
 
+@lru_cache(maxsize=128)
+def _compute_ticks(major, minor, log, s_min, s_max, align=False):
+    '''Returns the positions of the major and minor ticks as two tuples.
+    The results are memoized, the bounds and ticks of an axis often being the
+    same from one redraw to the next.
+    '''
+    if not major or s_max <= s_min:
+        return (), ()
+    if not log:
+        return _linear_ticks(major, minor, s_min, s_max, align)
+    return _log_ticks(major, minor, log10(s_min), log10(s_max))
+
+
+def _linear_ticks(major, minor, s_min, s_max, align):
+    # distance between each tick
+    tick_dist = major / float(minor if minor else 1.0)
+    start = s_min
+    if align or (s_max > 0 and s_min < 0):
+        start = floor(s_min / major) * major
+    n_ticks = int(floor((s_max - start) / tick_dist) + 1)
+    if np is not None:
+        m = np.arange(n_ticks)
+        points = m * tick_dist + start
+        visible = points >= s_min
+        if minor:
+            is_minor = (m % minor) != 0
+        else:
+            is_minor = np.zeros(n_ticks, dtype=bool)
+        return (tuple(points[visible & ~is_minor].tolist()),
+                tuple(points[visible & is_minor].tolist()))
+    points = [(m, m * tick_dist + start) for m in range(n_ticks)]
+    return (tuple(pt for m, pt in points
+                  if pt >= s_min and not (minor and m % minor)),
+            tuple(pt for m, pt in points
+                  if pt >= s_min and minor and m % minor))
+
+
+def _log_ticks(major, minor, s_min, s_max):
+    # in decade multiples, e.g. 0.1 of the decade, the distance
+    # between ticks
+    decade_dist = major / float(minor if minor else 1.0)
+    # because each decade is missing 0.1 of the decade, if a tick
+    # falls in < min_pos skip it
+    min_pos = 0.1 - 0.00001 * decade_dist
+    s_min_low = floor(s_min)
+    # first real tick location. value is in fractions of decades
+    # from the start we have to use decimals here, otherwise
+    # floating point inaccuracies results in bad values
+    start_dec = ceil((10 ** Decimal(s_min - s_min_low - 1)) /
+                     Decimal(decade_dist)) * decade_dist
+    count_min = (0 if not minor else
+                 floor(start_dec / decade_dist) % minor)
+    start_dec += s_min_low
+    # the ticks stop at the first one above s_max, at the latest at the
+    # decade boundary following s_max (or the next one if it falls between
+    # two ticks)
+    n_ticks = int(ceil((floor(s_max) + 2 - start_dec) / decade_dist)) + 1
+    if n_ticks <= 0:
+        return (), ()
+    if np is not None:
+        count = np.arange(n_ticks)
+        # the current position in decade, e.g. -0.9 means that we're at
+        # 0.1 of the 10**ceil(-0.9) decade
+        pos_dec = start_dec + decade_dist * count
+        pos_dec_low = np.floor(pos_dec)
+        diff = pos_dec - pos_dec_low
+        zero = np.abs(diff) < 0.001 * decade_dist
+        # the same value as pos_dec but in log scale
+        pos_log = np.where(zero, pos_dec_low, np.log10(
+            np.where(zero, 1., diff) * 10. ** np.ceil(pos_dec)))
+        above = np.flatnonzero(pos_log > s_max)
+        stop = above[0] if len(above) else n_ticks
+        visible = (zero | (diff >= min_pos))[:stop]
+        if minor:
+            is_major = ((count[:stop] + count_min) % minor) == 0
+        else:
+            is_major = np.zeros(stop, dtype=bool)
+        pos_log = pos_log[:stop]
+        return (tuple(pos_log[visible & is_major].tolist()),
+                tuple(pos_log[visible & ~is_major].tolist()))
+    points = []
+    for count in range(n_ticks):
+        pos_dec = start_dec + decade_dist * count
+        pos_dec_low = floor(pos_dec)
+        diff = pos_dec - pos_dec_low
+        zero = abs(diff) < 0.001 * decade_dist
+        pos_log = pos_dec_low if zero else log10(
+            diff * 10 ** ceil(pos_dec))
+        if pos_log > s_max:
+            break
+        if zero or diff >= min_pos:
+            points.append((count + count_min, pos_log))
+    return (tuple(pt for m, pt in points if minor and not m % minor),
+            tuple(pt for m, pt in points if not (minor and not m % minor)))
+
+
+def nice_tick_spacing(s_min, s_max, max_ticks):
+    '''Returns `(major, minor)`: a "nice" distance between major ticks, 1, 2
+    or 5 times a power of ten, giving at most about `max_ticks` major ticks
+    between `s_min` and `s_max`, and the matching number of minor intervals.
+    Returns `(0, 0)` (no ticks) if the range or `max_ticks` is empty.
+
+    >>> graph.x_ticks_major, graph.x_ticks_minor = nice_tick_spacing(
+    ...     graph.xmin, graph.xmax, graph.width / 100)
+    '''
+    span = float(s_max - s_min)
+    if not span > 0 or not max_ticks >= 1:
+        return 0, 0
+    raw = span / max_ticks
+    exponent = int(floor(log10(raw)))
+    for step, minor in ((1, 5), (2, 4), (5, 5), (10, 5)):
+        # built from its decimal notation to avoid 9.999999999999999e-06
+        major = float('%de%d' % (step, exponent))
+        if major >= raw:
+            return major, minor
+    return major, minor
+
+
 Builder.load_string("""
 <GraphRotatedLabel>:
     canvas.before:
@@ -104,6 +322,34 @@ class GraphRotatedLabel(Label):
     angle = NumericProperty(0)
 
 
+class _TickLabelCache(object):
+    '''LRU pool of tick labels no longer displayed by a graph. The labels
+    are keyed by their text and the options used to render it, so that their
+    texture can be reused instead of rendering the text again.
+    '''
+
+    def __init__(self, size=64):
+        self.size = size
+        self._labels = OrderedDict()
+
+    @staticmethod
+    def key(label, text):
+        return (label.__class__, text, label.font_name, label.font_size,
+                tuple(label.color), label.bold)
+
+    def pop(self, key):
+        return self._labels.pop(key, None)
+
+    def push(self, label):
+        if not label.text:
+            return
+        key = self.key(label, label.text)
+        self._labels.pop(key, None)
+        self._labels[key] = label
+        while len(self._labels) > self.size:
+            self._labels.popitem(last=False)
+
+
 class Axis(EventDispatcher):
     pass
 
@@ -181,6 +427,8 @@ class Graph(Widget):
 
     def __init__(self, **kwargs):
         super(Graph, self).__init__(**kwargs)
+        self._tick_label_cache = _TickLabelCache()
+        self._ticks_buffer = _VertexBuffer()
 
         with self.canvas:
             self._fbo = Fbo(size=self.size, with_stencilbuffer=self._with_stencilbuffer)
@@ -216,7 +464,7 @@ class Graph(Widget):
                   xlabel=t, x_grid_label=t, ymin=t, ymax=t, ylog=t,
                   y_ticks_major=t, y_ticks_minor=t, ylabel=t, y_grid_label=t,
                   font_size=t, label_options=t, x_ticks_angle=t, title=t,
-                  legend=t, legend_pos=t)
+                  legend=t, legend_pos=t, align_ticks=t)
         self.bind(tick_color=tc, background_color=tc, border_color=tc)
         self._trigger()
 
@@ -237,102 +485,42 @@ class Graph(Widget):
             self.canvas = canvas
 
     def _get_ticks(self, major, minor, log, s_min, s_max):
-        if major and s_max > s_min:
-            if log:
-                s_min = log10(s_min)
-                s_max = log10(s_max)
-                # count the decades in min - max. This is in actual decades,
-                # not logs.
-                n_decades = floor(s_max - s_min)
-                # for the fractional part of the last decade, we need to
-                # convert the log value, x, to 10**x but need to handle
-                # differently if the last incomplete decade has a decade
-                # boundary in it
-                if floor(s_min + n_decades) != floor(s_max):
-                    n_decades += 1 - (10 ** (s_min + n_decades + 1) - 10 **
-                                      s_max) / 10 ** floor(s_max + 1)
-                else:
-                    n_decades += ((10 ** s_max - 10 ** (s_min + n_decades)) /
-                                  10 ** floor(s_max + 1))
-                # this might be larger than what is needed, but we delete
-                # excess later
-                n_ticks_major = n_decades / float(major)
-                n_ticks = int(floor(n_ticks_major * (minor if minor >=
-                                                     1. else 1.0))) + 2
-                # in decade multiples, e.g. 0.1 of the decade, the distance
-                # between ticks
-                decade_dist = major / float(minor if minor else 1.0)
-
-                points_minor = [0] * n_ticks
-                points_major = [0] * n_ticks
-                k = 0  # position in points major
-                k2 = 0  # position in points minor
-                # because each decade is missing 0.1 of the decade, if a tick
-                # falls in < min_pos skip it
-                min_pos = 0.1 - 0.00001 * decade_dist
-                s_min_low = floor(s_min)
-                # first real tick location. value is in fractions of decades
-                # from the start we have to use decimals here, otherwise
-                # floating point inaccuracies results in bad values
-                start_dec = ceil((10 ** Decimal(s_min - s_min_low - 1)) /
-                                 Decimal(decade_dist)) * decade_dist
-                count_min = (0 if not minor else
-                             floor(start_dec / decade_dist) % minor)
-                start_dec += s_min_low
-                count = 0  # number of ticks we currently have passed start
-                while True:
-                    # this is the current position in decade that we are.
-                    # e.g. -0.9 means that we're at 0.1 of the 10**ceil(-0.9)
-                    # decade
-                    pos_dec = start_dec + decade_dist * count
-                    pos_dec_low = floor(pos_dec)
-                    diff = pos_dec - pos_dec_low
-                    zero = abs(diff) < 0.001 * decade_dist
-                    if zero:
-                        # the same value as pos_dec but in log scale
-                        pos_log = pos_dec_low
-                    else:
-                        pos_log = log10((pos_dec - pos_dec_low
-                                         ) * 10 ** ceil(pos_dec))
-                    if pos_log > s_max:
-                        break
-                    count += 1
-                    if zero or diff >= min_pos:
-                        if minor and not count_min % minor:
-                            points_major[k] = pos_log
-                            k += 1
-                        else:
-                            points_minor[k2] = pos_log
-                            k2 += 1
-                    count_min += 1
+        points_major, points_minor = _compute_ticks(
+            major, minor, log, s_min, s_max, self.align_ticks)
+        return list(points_major), list(points_minor)
+
+    def _set_tick_labels(self, labels, texts):
+        '''Gives its text to each tick label of `labels`. The labels already
+        showing one of the texts are only moved, and the ones rendered earlier
+        are taken back from the cache, so only new texts are rendered.
+        '''
+        cache = self._tick_label_cache
+        available = {}
+        for label in labels:
+            available.setdefault(label.text, []).append(label)
+        result = [None] * len(texts)
+        for k, text in enumerate(texts):
+            same = available.get(text)
+            if same:
+                result[k] = same.pop()
+        free = [label for same in available.values() for label in same]
+        for k, text in enumerate(texts):
+            if result[k] is not None:
+                continue
+            label = free.pop()
+            cached = cache.pop(cache.key(label, text))
+            if cached is not None:
+                self.remove_widget(label)
+                cache.push(label)
+                self.add_widget(cached)
+                label = cached
             else:
-                # distance between each tick
-                tick_dist = major / float(minor if minor else 1.0)
-                min = s_min
-                if s_max > 0 and s_min < 0:
-                    min = floor(s_min / major) * major
-                n_ticks = int(floor((s_max - min) / tick_dist) + 1)
-                points_major = [0] * int(floor((s_max - min) / float(major))
-                                         + 1)
-                points_minor = [0] * (n_ticks - len(points_major) + 1)
-                k = 0  # position in points major
-                k2 = 0  # position in points minor
-                for m in range(0, n_ticks):
-                    pt = m * tick_dist + min
-                    if pt < s_min:
-                        continue
-                    if minor and m % minor:
-                        points_minor[k2] = pt
-                        k2 += 1
-                    else:
-                        points_major[k] = pt
-                        k += 1
-            del points_major[k:]
-            del points_minor[k2:]
-        else:
-            points_major = []
-            points_minor = []
-        return points_major, points_minor
+                label.text = text
+                label.texture_update()
+            result[k] = label
+        for label in result:
+            label.opacity = 1
+        labels[:] = result
 
     def _update_labels(self):
         xlabel = self._xlabel
@@ -384,8 +572,8 @@ class Graph(Widget):
             # horizontal size of the largest tick label, to have enough room
             funcexp = exp10 if self.ylog else identity
             funclog = log10 if self.ylog else identity
-            ylabels[0].text = precision % funcexp(ypoints[0])
-            ylabels[0].texture_update()
+            self._set_tick_labels(ylabels, [precision % funcexp(ypoints[k])
+                                            for k in range(len(ylabels))])
             y1 = ylabels[0].texture_size
             y_start = y_next + (padding + y1[1] if len(xlabels) and xlabel_grid
                                 else 0) + \
@@ -399,8 +587,6 @@ class Graph(Widget):
             y_start -= y1[1] / 2.
             y1 = y1[0]
             for k in range(len(ylabels)):
-                ylabels[k].text = precision % funcexp(ypoints[k])
-                ylabels[k].texture_update()
                 ylabels[k].size = ylabels[k].texture_size
                 y1 = max(y1, ylabels[k].texture_size[0])
                 ylabels[k].pos = (
@@ -413,22 +599,18 @@ class Graph(Widget):
         if len(xlabels) and xlabel_grid:
             funcexp = exp10 if self.xlog else identity
             funclog = log10 if self.xlog else identity
+            self._set_tick_labels(xlabels, [precision % funcexp(xpoints[k])
+                                            for k in range(len(xlabels))])
             # find the distance from the end that'll fit the last tick label
-            xlabels[0].text = precision % funcexp(xpoints[-1])
-            xlabels[0].texture_update()
-            xextent = x + width - xlabels[0].texture_size[0] / 2. - padding
+            xextent = x + width - xlabels[-1].texture_size[0] / 2. - padding
             # find the distance from the start that'll fit the first tick label
             if not x_next:
-                xlabels[0].text = precision % funcexp(xpoints[0])
-                xlabels[0].texture_update()
                 x_next = padding + xlabels[0].texture_size[0] / 2.
             xmin = funclog(xmin)
             ratio = (xextent - x_next) / float(funclog(self.xmax) - xmin)
             right = -1
             for k in range(len(xlabels)):
-                xlabels[k].text = precision % funcexp(xpoints[k])
                 # update the size so we can center the labels on ticks
-                xlabels[k].texture_update()
                 xlabels[k].size = xlabels[k].texture_size
                 half_ts = xlabels[k].texture_size[0] / 2.
                 xlabels[k].pos = (
@@ -448,12 +630,13 @@ class Graph(Widget):
         if ylabel:
             ylabel.y = int(y_next + (yextent - y_next) / 2. - ylabel.height / 2.)
             ylabel.angle = 90
+        # hide the labels without clearing their text, to keep their texture
         if x_overlap:
             for k in range(len(xlabels)):
-                xlabels[k].text = ''
+                xlabels[k].opacity = 0
         if y_overlap:
             for k in range(len(ylabels)):
-                ylabels[k].text = ''
+                ylabels[k].opacity = 0
         return x_next - x, y_next - y, xextent - x, yextent - y
 
     def _update_ticks(self, size):
@@ -475,62 +658,56 @@ class Graph(Widget):
         else:
             vert[0:18] = [0 for k in range(18)]
         mesh.vertices = vert
-        # re-compute the positions of the x/y axis ticks
-        mesh = self._mesh_ticks
-        vert = mesh.vertices
-        start = 0
+        # re-compute the positions of the x/y axis ticks, two vertices per
+        # tick written column by column into the reused buffer
         xpoints = self._ticks_majorx
         ypoints = self._ticks_majory
         xpoints2 = self._ticks_minorx
         ypoints2 = self._ticks_minory
-        ylog = self.ylog
-        xlog = self.xlog
         xmin = self.xmin
         xmax = self.xmax
-        if xlog:
+        if self.xlog:
             xmin = log10(xmin)
             xmax = log10(xmax)
         ymin = self.ymin
         ymax = self.ymax
-        if ylog:
+        if self.ylog:
             ymin = log10(ymin)
             ymax = log10(ymax)
-        if len(xpoints):
-            top = size[3] if self.x_grid else metrics.dp(12) + size[1]
-            ratio = (size[2] - size[0]) / float(xmax - xmin)
-            for k in range(start, len(xpoints) + start):
-                vert[k * 8] = size[0] + (xpoints[k - start] - xmin) * ratio
-                vert[k * 8 + 1] = size[1]
-                vert[k * 8 + 4] = vert[k * 8]
-                vert[k * 8 + 5] = top
-            start += len(xpoints)
-        if len(xpoints2):
-            top = metrics.dp(8) + size[1]
-            ratio = (size[2] - size[0]) / float(xmax - xmin)
-            for k in range(start, len(xpoints2) + start):
-                vert[k * 8] = size[0] + (xpoints2[k - start] - xmin) * ratio
-                vert[k * 8 + 1] = size[1]
-                vert[k * 8 + 4] = vert[k * 8]
-                vert[k * 8 + 5] = top
-            start += len(xpoints2)
-        if len(ypoints):
-            top = size[2] if self.y_grid else metrics.dp(12) + size[0]
-            ratio = (size[3] - size[1]) / float(ymax - ymin)
-            for k in range(start, len(ypoints) + start):
-                vert[k * 8 + 1] = size[1] + (ypoints[k - start] - ymin) * ratio
-                vert[k * 8 + 5] = vert[k * 8 + 1]
-                vert[k * 8] = size[0]
-                vert[k * 8 + 4] = top
-            start += len(ypoints)
-        if len(ypoints2):
-            top = metrics.dp(8) + size[0]
-            ratio = (size[3] - size[1]) / float(ymax - ymin)
-            for k in range(start, len(ypoints2) + start):
-                vert[k * 8 + 1] = size[1] + (ypoints2[k - start] - ymin) * ratio
-                vert[k * 8 + 5] = vert[k * 8 + 1]
-                vert[k * 8] = size[0]
-                vert[k * 8 + 4] = top
-        mesh.vertices = vert
+        mesh = self._mesh_ticks
+        buf = self._ticks_buffer
+        total = 2 * (len(xpoints) + len(xpoints2) + len(ypoints) +
+                     len(ypoints2))
+        vert = buf.vertices(total)
+        start = 0
+        for points, top, axis in (
+                (xpoints, size[3] if self.x_grid else metrics.dp(12) + size[1],
+                 0),
+                (xpoints2, metrics.dp(8) + size[1], 0),
+                (ypoints, size[2] if self.y_grid else metrics.dp(12) + size[0],
+                 1),
+                (ypoints2, metrics.dp(8) + size[0], 1)):
+            n = len(points)
+            if not n:
+                continue
+            if axis == 0:
+                ratio = (size[2] - size[0]) / float(xmax - xmin)
+                offset, vmin = size[0], xmin
+            else:
+                ratio = (size[3] - size[1]) / float(ymax - ymin)
+                offset, vmin = size[1], ymin
+            if np is not None:
+                pos = offset + (np.asarray(points, dtype=np.float64) - vmin) * ratio
+            else:
+                pos = [offset + (p - vmin) * ratio for p in points]
+            # the position along the axis, then the two ends of the tick
+            _write_column(vert, start + axis, 8, n, pos)
+            _write_column(vert, start + 4 + axis, 8, n, pos)
+            _write_column(vert, start + 1 - axis, 8, n, size[1 - axis])
+            _write_column(vert, start + 5 - axis, 8, n, top)
+            start += 8 * n
+        mesh.vertices = buf.view(total)
+        mesh.indices = buf.indices(total)
 
     x_axis = ListProperty([None])
     y_axis = ListProperty([None])
@@ -583,11 +760,6 @@ class Graph(Widget):
         self._redraw_title(*args)
         self._redraw_legend(*args)
 
-        mesh = self._mesh_ticks
-        n_points = (len(xpoints_major) + len(xpoints_minor) +
-                    len(ypoints_major) + len(ypoints_minor))
-        mesh.vertices = [0] * (n_points * 8)
-        mesh.indices = [k for k in range(n_points * 2)]
         self._redraw_size()
     
     def _redraw_title(self, *arg):
@@ -641,6 +813,7 @@ class Graph(Widget):
 
         for k in range(n_labels, len(grids)):
             self.remove_widget(grids[k])
+            self._tick_label_cache.push(grids[k])
         del grids[n_labels:]
 
         grid_len = len(grids)
@@ -687,6 +860,7 @@ class Graph(Widget):
 
         for k in range(n_labels, len(grids)):
             self.remove_widget(grids[k])
+            self._tick_label_cache.push(grids[k])
         del grids[n_labels:]
 
         grid_len = len(grids)
@@ -1076,6 +1250,15 @@ class Graph(Widget):
     defaults to ''.
     '''
     
+    align_ticks = BooleanProperty(False)
+    '''Whether the ticks of linear axes are placed on multiples of the major
+    tick distance instead of starting at the axis minimum. Used together with
+    :func:`nice_tick_spacing` it gives round tick labels.
+
+    :data:`align_ticks` is a :class:`~kivy.properties.BooleanProperty`,
+    defaults to False.
+    '''
+
     legend = BooleanProperty(False)
     '''Whether a legend is added.
     Don't forget to set the `label` property of the plot, otherwise no legend
@@ -1167,10 +1350,23 @@ class Plot(EventDispatcher):
     ''.
     '''
 
+    xy_data = ObjectProperty(None, allownone=True, force_dispatch=True)
+    '''Data of the plot given as a pair `(x, y)` of sequences of the same
+    length, e.g. lists, :class:`array.array`, memoryviews or numpy arrays.
+    When set, it is used instead of :data:`points`: the values are read
+    directly, without building a tuple per point, and the projection is
+    vectorized when numpy is available. Reassign it (even with the same
+    sequences) when their content changes.
+
+    :data:`xy_data` is a :class:`~kivy.properties.ObjectProperty`, defaults
+    to None.
+    '''
+
     def __init__(self, **kwargs):
         super(Plot, self).__init__(**kwargs)
         self.ask_draw = Clock.create_trigger(self.draw)
-        self.bind(params=self.ask_draw, points=self.ask_draw)
+        self.bind(params=self.ask_draw, points=self.ask_draw,
+                  xy_data=self.ask_draw)
         self._drawings = self.create_drawings()
 
     def funcx(self):
@@ -1248,10 +1444,17 @@ class Plot(EventDispatcher):
         size a 4-tuple describing the bounding box in which we can draw
         graphs, it's (x0, y0, x1, y1), which correspond with the bottom left
         and top right corner locations, respectively.
+
+        The plot is only redrawn if one of the parameters actually changed.
         '''
-        self.params.update({
+        params = {
             'xlog': xlog, 'xmin': xmin, 'xmax': xmax, 'ylog': ylog,
-            'ymin': ymin, 'ymax': ymax, 'size': size})
+            'ymin': ymin, 'ymax': ymax, 'size': tuple(size)}
+        old_params = self.params
+        for key, value in params.items():
+            if old_params.get(key) != value:
+                old_params.update(params)
+                return
 
     def get_group(self):
         '''returns a string which is unique and is the group name given to all
@@ -1280,14 +1483,68 @@ class Plot(EventDispatcher):
         '''
         self.dispatch('on_clear_plot')
 
+    def count_points(self):
+        '''Return the number of points of the plot, from :data:`xy_data` if
+        set, :data:`points` otherwise.
+        '''
+        if self.xy_data is not None:
+            return min(len(self.xy_data[0]), len(self.xy_data[1]))
+        return len(self.points)
+
+    def iterate_data(self):
+        '''Iterate on all the (x, y) points in data coordinates, from
+        :data:`xy_data` if set, :data:`points` otherwise.
+        '''
+        if self.xy_data is not None:
+            return zip(*self.xy_data)
+        return iter(self.points)
+
     def iterate_points(self):
         '''Iterate on all the points adjusted to the graph settings
         '''
         x_px = self.x_px()
         y_px = self.y_px()
-        for x, y in self.points:
+        for x, y in self.iterate_data():
             yield x_px(x), y_px(y)
 
+    def project(self, values, axis):
+        '''Return the pixel coordinates of the `values` of the axis `axis`
+        ('x' or 'y'), relative to the graph pos, as a numpy array if numpy is
+        available, a list otherwise.
+        '''
+        params = self.params
+        size = params['size']
+        log = params[axis + 'log']
+        func = log10 if log else identity
+        vmin = func(params[axis + 'min'])
+        low, high = (size[0], size[2]) if axis == 'x' else (size[1], size[3])
+        ratio = (high - low) / float(func(params[axis + 'max']) - vmin)
+        offset = low - vmin * ratio
+        if np is not None:
+            values = np.asarray(values, dtype=float)
+            if log:
+                values = np.log10(values)
+            return values * ratio + offset
+        return [func(value) * ratio + offset for value in values]
+
+    def project_points(self):
+        '''Return the x and y pixel coordinates of all the points, relative
+        to the graph pos, as two numpy arrays if numpy is available, two lists
+        otherwise.
+        '''
+        if self.xy_data is not None:
+            x, y = self.xy_data
+            n = self.count_points()
+            if len(x) != n or len(y) != n:
+                x, y = x[:n], y[:n]
+        elif np is not None:
+            data = np.asarray(self.points, dtype=float).reshape(-1, 2)
+            x, y = data[:, 0], data[:, 1]
+        else:
+            x = [point[0] for point in self.points]
+            y = [point[1] for point in self.points]
+        return self.project(x, 'x'), self.project(y, 'y')
+
     def on_clear_plot(self, *largs):
         pass
 
@@ -1308,20 +1565,9 @@ class DotPlot(Plot):
         return [self._color, self._mesh]
 
     def draw(self, *args):
-        points = self.points
         mesh = self._mesh
-        params = self._params
-        funcx = log10 if params['xlog'] else identity
-        funcy = log10 if params['ylog'] else identity
-        xmin = funcx(params['xmin'])
-        ymin = funcy(params['ymin'])
-        size = params['size']
-        ratiox = (size[2] - size[0]) / float(funcx(params['xmax']) - xmin)
-        ratioy = (size[3] - size[1]) / float(funcy(params['ymax']) - ymin)
         mesh.points = ()
-        for k in range(len(points)):
-            x = (funcx(points[k][0]) - xmin) * ratiox + size[0]
-            y = (funcy(points[k][1]) - ymin) * ratioy + size[1]
+        for x, y in zip(*self.project_points()):
             mesh.add_point(x, y)
 
     def _set_pointsize(self, value):
@@ -1341,11 +1587,19 @@ class DotPlot(Plot):
 
 class MeshLinePlot(Plot):
     '''MeshLinePlot class which displays a set of points similar to a mesh.
+    The vertices are written into reusable float buffers, and the plot is
+    split into several meshes when it has more vertices than the unsigned
+    short indices of a mesh can address.
     '''
 
+    # Maximal number of vertices of each mesh, even so that the pairs of
+    # vertices drawn in 'lines' mode are never split
+    MAX_MESH_VERTICES = 65534
+
     def _set_mode(self, value):
         if hasattr(self, '_mesh'):
-            self._mesh.mode = value
+            for mesh in self._meshes:
+                mesh.mode = value
 
     mode = AliasProperty(lambda self: self._mesh.mode, _set_mode)
     '''VBO Mode used for drawing the points. Can be one of: 'points',
@@ -1358,25 +1612,60 @@ class MeshLinePlot(Plot):
     def create_drawings(self):
         self._color = Color(*self.color)
         self._mesh = Mesh(mode='line_strip')
+        self._meshes = [self._mesh]
+        self._buffers = [_VertexBuffer()]
+        self._mesh_group = InstructionGroup()
+        self._mesh_group.add(self._mesh)
         self.bind(color=lambda instr, value: setattr(self._color, "rgba", value))
-        return [self._color, self._mesh]
+        return [self._color, self._mesh_group]
 
     def draw(self, *args):
         super(MeshLinePlot, self).draw(*args)
         self.plot_mesh()
 
     def plot_mesh(self):
-        points = [p for p in self.iterate_points()]
-        mesh, vert, _ = self.set_mesh_size(len(points))
-        for k, (x, y) in enumerate(points):
-            vert[k * 4] = x
-            vert[k * 4 + 1] = y
-        mesh.vertices = vert
+        self.set_vertices(*self.project_points())
+
+    def set_vertices(self, x, y):
+        '''Set the vertices of the plot from the sequences of their pixel
+        coordinates `x` and `y`, splitting them in as many meshes as needed.
+        '''
+        n = min(len(x), len(y))
+        # consecutive line_strip meshes share a vertex so the line is continuous
+        overlap = 1 if self._mesh.mode == 'line_strip' else 0
+        chunks = []
+        start = 0
+        while True:
+            stop = min(start + self.MAX_MESH_VERTICES, n)
+            chunks.append((start, stop))
+            if stop >= n:
+                break
+            start = stop - overlap
+
+        for k, (start, stop) in enumerate(chunks):
+            if k == len(self._meshes):
+                mesh = Mesh(mode=self._mesh.mode)
+                self._meshes.append(mesh)
+                self._buffers.append(_VertexBuffer())
+                self._mesh_group.add(mesh)
+            count = stop - start
+            buf = self._buffers[k]
+            vert = buf.vertices(count)
+            _write_column(vert, 0, 4, count, x[start:stop])
+            _write_column(vert, 1, 4, count, y[start:stop])
+            mesh = self._meshes[k]
+            mesh.vertices = buf.view(count)
+            mesh.indices = buf.indices(count)
+
+        for mesh in self._meshes[len(chunks):]:
+            self._mesh_group.remove(mesh)
+        del self._meshes[len(chunks):]
+        del self._buffers[len(chunks):]
 
     def set_mesh_size(self, size):
         mesh = self._mesh
-        vert = mesh.vertices
-        ind = mesh.indices
+        vert = list(mesh.vertices)
+        ind = list(mesh.indices)
         diff = size - len(vert) // 4
         if diff < 0:
             del vert[4 * size:]
@@ -1385,6 +1674,7 @@ class MeshLinePlot(Plot):
             ind.extend(range(len(ind), len(ind) + diff))
             vert.extend([0] * (diff * 4))
         mesh.vertices = vert
+        mesh.indices = ind
         return mesh, vert, ind
 
 
@@ -1394,15 +1684,9 @@ class MeshStemPlot(MeshLinePlot):
     '''
 
     def plot_mesh(self):
-        points = [p for p in self.iterate_points()]
-        mesh, vert, _ = self.set_mesh_size(len(points) * 2)
-        y0 = self.y_px()(0)
-        for k, (x, y) in enumerate(self.iterate_points()):
-            vert[k * 8] = x
-            vert[k * 8 + 1] = y0
-            vert[k * 8 + 4] = x
-            vert[k * 8 + 5] = y
-        mesh.vertices = vert
+        x, y = self.project_points()
+        # each stem goes from (x, y0) to (x, y)
+        self.set_vertices(_interleave(x, x), _interleave(self.y_px()(0), y))
 
 
 class LinePlot(Plot):
@@ -1427,11 +1711,7 @@ class LinePlot(Plot):
 
     def draw(self, *args):
         super(LinePlot, self).draw(*args)
-        # flatten the list
-        points = []
-        for x, y in self.iterate_points():
-            points += [x, y]
-        self._gline.points = points
+        self._gline.points = interleave(*self.project_points())
 
     def on_line_width(self, *largs):
         if hasattr(self, "_gline"):
@@ -1441,10 +1721,57 @@ class LinePlot(Plot):
 class SmoothLinePlot(Plot):
     '''Smooth Plot class, see module documentation for more information.
     This plot use a specific Fragment shader for a custom anti aliasing.
+
+    If :data:`gpu_transform` is True, the points are uploaded once in data
+    coordinates and the projection to pixels is done by the vertex shader, so
+    zooming or panning only updates a few uniforms.
     '''
     
     line_width = NumericProperty(2.)
     
+    gpu_transform = BooleanProperty(False)
+    '''Whether the data to pixel transformation is done in the vertex shader.
+    Must be given at creation, e.g. `SmoothLinePlot(gpu_transform=True)`.
+    When there are too many points for a single mesh, the plot falls back to
+    the CPU projection.
+
+    :data:`gpu_transform` is a :class:`~kivy.properties.BooleanProperty`,
+    defaults to False.
+    '''
+
+    # Maximal number of points of the mesh, each point gives two vertices and
+    # the indices are unsigned shorts.
+    GPU_MAX_POINTS = 32767
+
+    # The vertices are (x, y) in data coordinates (after log10 if the axis is
+    # logarithmic), the texture coordinate gives the side of the line and
+    # vTangent the direction of the curve, also in data coordinates.
+    GPU_VS = '''
+    $HEADER$
+    attribute vec2 vTangent;
+    uniform vec2 data_scale;
+    uniform vec2 data_offset;
+    uniform float half_width;
+
+    void main(void) {
+        frag_color = color * vec4(1., 1., 1., opacity);
+        tex_coord0 = vTexCoords0;
+        vec2 tangent = vTangent * data_scale;
+        float len = length(tangent);
+        vec2 normal = vec2(0., 1.);
+        if (len > 0.) {
+            normal = vec2(-tangent.y, tangent.x) / len;
+        }
+        float side = vTexCoords0.y * 2. - 1.;
+        vec2 pos = vPosition.xy * data_scale + data_offset
+                   + normal * side * half_width;
+        gl_Position = projection_mat * modelview_mat * vec4(pos, 0., 1.);
+    }
+    '''
+
+    GPU_FMT = [(b'vPosition', 2, 'float'), (b'vTexCoords0', 2, 'float'),
+               (b'vTangent', 2, 'float')]
+
     SMOOTH_FS = '''
     $HEADER$
 
@@ -1480,15 +1807,31 @@ class SmoothLinePlot(Plot):
             SmoothLinePlot._texture = tex
             SmoothLinePlot._smooth_reload_observer(tex)
 
-        self._grc = RenderContext(
-            fs=SmoothLinePlot.SMOOTH_FS,
-            use_parent_modelview=True,
-            use_parent_projection=True)
+        if self.gpu_transform:
+            self._grc = RenderContext(
+                vs=SmoothLinePlot.GPU_VS,
+                fs=SmoothLinePlot.SMOOTH_FS,
+                use_parent_modelview=True,
+                use_parent_projection=True)
+        else:
+            self._grc = RenderContext(
+                fs=SmoothLinePlot.SMOOTH_FS,
+                use_parent_modelview=True,
+                use_parent_projection=True)
         with self._grc:
             self._gcolor = Color(*self.color)
             self._gline = Line(
                 points=[], cap='none', width=self.line_width,
                 texture=SmoothLinePlot._texture)
+            if self.gpu_transform:
+                self._gmesh = Mesh(fmt=SmoothLinePlot.GPU_FMT,
+                                   mode='triangle_strip',
+                                   texture=SmoothLinePlot._texture)
+        # (xlog, ylog) of the uploaded vertices, None if they must be rebuilt
+        self._gpu_uploaded = None
+        self._gpu_buffer = _VertexBuffer()
+        self.bind(points=self._invalidate_gpu_vertices,
+                  xy_data=self._invalidate_gpu_vertices)
 
         return [self._grc]
 
@@ -1496,13 +1839,231 @@ class SmoothLinePlot(Plot):
     def _smooth_reload_observer(texture):
         texture.blit_buffer(SmoothLinePlot.GRADIENT_DATA, colorfmt="rgb")
 
+    def _invalidate_gpu_vertices(self, *args):
+        self._gpu_uploaded = None
+
     def draw(self, *args):
         super(SmoothLinePlot, self).draw(*args)
-        # flatten the list
-        points = []
-        for x, y in self.iterate_points():
-            points += [x, y]
-        self._gline.points = points
+        if self.gpu_transform and self.count_points() <= self.GPU_MAX_POINTS:
+            self._draw_gpu()
+            return
+        if self.gpu_transform:
+            # back to the CPU projection, the shader must be the identity
+            self._gmesh.vertices = []
+            self._gmesh.indices = []
+            self._gpu_uploaded = None
+            self._set_gpu_uniforms((1., 1.), (0., 0.), 0.)
+        self._gline.points = interleave(*self.project_points())
+
+    def _set_gpu_uniforms(self, scale, offset, half_width):
+        self._grc['data_scale'] = (float(scale[0]), float(scale[1]))
+        self._grc['data_offset'] = (float(offset[0]), float(offset[1]))
+        self._grc['half_width'] = float(half_width)
+
+    def _draw_gpu(self):
+        params = self.params
+        funcx = log10 if params['xlog'] else identity
+        funcy = log10 if params['ylog'] else identity
+        logs = (params['xlog'], params['ylog'])
+        if self._gpu_uploaded != logs:
+            self._gline.points = []
+            self._upload_gpu_vertices(funcx, funcy)
+            self._gpu_uploaded = logs
+
+        # only the affine transformation depends on the axis bounds
+        size = params['size']
+        xmin = funcx(params['xmin'])
+        ymin = funcy(params['ymin'])
+        ratiox = (size[2] - size[0]) / float(funcx(params['xmax']) - xmin)
+        ratioy = (size[3] - size[1]) / float(funcy(params['ymax']) - ymin)
+        self._set_gpu_uniforms((ratiox, ratioy),
+                               (size[0] - xmin * ratiox,
+                                size[1] - ymin * ratioy),
+                               self.line_width / 2.)
+
+    def _upload_gpu_vertices(self, funcx, funcy):
+        if self.xy_data is not None:
+            n = self.count_points()
+            x, y = self.xy_data[0][:n], self.xy_data[1][:n]
+        else:
+            n = len(self.points)
+            x = [point[0] for point in self.points]
+            y = [point[1] for point in self.points]
+        buf = self._gpu_buffer
+        if n == 0:
+            self._gmesh.vertices = []
+            self._gmesh.indices = []
+            return
+        columns = []
+        for values, func in ((x, funcx), (y, funcy)):
+            # the tangent is the central difference, one sided at both ends
+            if np is not None:
+                values = np.asarray(values, dtype=np.float64)
+                if func is not identity:
+                    values = np.log10(values)
+                padded = np.concatenate((values[:1], values, values[-1:]))
+                delta = padded[2:] - padded[:-2]
+            else:
+                values = [func(value) for value in values]
+                padded = values[:1] + values + values[-1:]
+                delta = [b - a for a, b in zip(padded, padded[2:])]
+            columns.append((values, delta))
+        (x, dx), (y, dy) = columns
+        # two vertices of 6 floats per point: x, y, u, v, dx, dy
+        vert = buf.vertices(3 * n)
+        for offset, values in ((0, x), (1, y), (2, 0.), (3, 0.), (4, dx),
+                               (5, dy), (6, x), (7, y), (8, 0.), (9, 1.),
+                               (10, dx), (11, dy)):
+            _write_column(vert, offset, 12, n, values)
+        self._gmesh.vertices = buf.view(3 * n)
+        self._gmesh.indices = buf.indices(2 * n)
+
+    def on_line_width(self, *largs):
+        if hasattr(self, "_gline"):
+            self._gline.width = self.line_width
+        if getattr(self, '_gpu_uploaded', None) is not None:
+            self._grc['half_width'] = self.line_width / 2.
+
+
+class AnalyticLinePlot(SmoothLinePlot):
+    '''Plot of a function y = f(x), e.g. a regression line, evaluated only
+    where it is displayed instead of being given as a list of points. The
+    function is the straight line :data:`slope` * x + :data:`intercept`, or
+    :data:`function` if set.
+
+    A straight line on linear axes is drawn with only two vertices, at the
+    left and right edges of the graph. Otherwise the function is sampled
+    adaptively between these edges: a segment is split while its middle is
+    more than :data:`tolerance` pixels away from the curve, up to
+    :data:`max_points` points. The x values where the function cannot be
+    evaluated (or is not positive on a logarithmic y axis) are skipped.
+
+    :data:`points`, :data:`xy_data` and :data:`gpu_transform` are not used.
+    '''
+
+    slope = NumericProperty(0.)
+    '''Slope of the line, used when :data:`function` is None.
+
+    :data:`slope` is a :class:`~kivy.properties.NumericProperty`, defaults
+    to 0.
+    '''
+
+    intercept = NumericProperty(0.)
+    '''Intercept of the line, used when :data:`function` is None.
+
+    :data:`intercept` is a :class:`~kivy.properties.NumericProperty`,
+    defaults to 0.
+    '''
+
+    function = ObjectProperty(None, allownone=True)
+    '''Callable returning y for a value x of the data coordinates. When
+    None, the line defined by :data:`slope` and :data:`intercept` is drawn.
+
+    :data:`function` is a :class:`~kivy.properties.ObjectProperty`, defaults
+    to None.
+    '''
+
+    tolerance = NumericProperty(.5)
+    '''Maximal distance in pixels between the drawn segments and the curve.
+
+    :data:`tolerance` is a :class:`~kivy.properties.NumericProperty`,
+    defaults to 0.5.
+    '''
+
+    max_points = NumericProperty(256)
+    '''Maximal number of points of the sampled curve.
+
+    :data:`max_points` is a :class:`~kivy.properties.NumericProperty`,
+    defaults to 256.
+    '''
+
+    def __init__(self, **kwargs):
+        kwargs['gpu_transform'] = False
+        super(AnalyticLinePlot, self).__init__(**kwargs)
+        self.bind(slope=self.ask_draw, intercept=self.ask_draw,
+                  function=self.ask_draw, tolerance=self.ask_draw,
+                  max_points=self.ask_draw)
+
+    def evaluate(self, x):
+        '''Return the value of the function at `x`, in data coordinates.
+        '''
+        if self.function is not None:
+            return self.function(x)
+        return self.slope * x + self.intercept
+
+    def count_points(self):
+        return len(self.sample()[0])
+
+    def iterate_data(self):
+        return zip(*self.sample())
+
+    def sample(self):
+        '''Return the x and y data coordinates of the vertices of the curve
+        over the current x range of the graph, as two lists.
+        '''
+        return self._sample()[:2]
+
+    def _sample(self):
+        # returns the data coordinates then the pixel coordinates
+        params = self.params
+        size = params['size']
+        xlog = params['xlog']
+        funcx = log10 if xlog else identity
+        invx = exp10 if xlog else identity
+        umin = funcx(params['xmin'])
+        ratiox = (size[2] - size[0]) / float(funcx(params['xmax']) - umin)
+        y_px = self.y_px()
+
+        def point(u):
+            # (x, y, y pixel) at the abscissa u on the axis, None if undefined
+            x = invx(u)
+            try:
+                y = float(self.evaluate(x))
+                return x, y, y_px(y)
+            except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+                return None
+
+        umax = funcx(params['xmax'])
+        if self.function is None and not xlog and not params['ylog']:
+            steps = 1
+        else:
+            steps = 8
+        pts = []
+        for k in range(steps + 1):
+            u = umin + (umax - umin) * k / float(steps)
+            pts.append((u, point(u)))
+        if steps > 1:
+            tolerance = self.tolerance
+            max_points = self.max_points
+            k = 0
+            while k < len(pts) - 1 and len(pts) < max_points:
+                (ua, a), (ub, b) = pts[k], pts[k + 1]
+                split = False
+                if (ub - ua) * abs(ratiox) > 1:
+                    um = (ua + ub) / 2.
+                    m = point(um)
+                    if a is not None and b is not None and m is not None:
+                        split = abs(m[2] - (a[2] + b[2]) / 2.) > tolerance
+                    else:
+                        # look for the edge of the domain of the function
+                        split = (a is None) != (b is None)
+                if split:
+                    pts.insert(k + 1, (um, m))
+                else:
+                    k += 1
+
+        x, y, px = [], [], []
+        for u, p in pts:
+            if p is not None:
+                x.append(p[0])
+                y.append(p[1])
+                px.append((u - umin) * ratiox + size[0])
+                px.append(p[2])
+        return x, y, px
+
+    def draw(self, *args):
+        Plot.draw(self, *args)
+        self._gline.points = self._sample()[2]
 
 
 class ContourPlot(Plot):
@@ -1605,6 +2166,7 @@ class BarPlot(Plot):
     def create_drawings(self):
         self._color = Color(*self.color)
         self._mesh = Mesh()
+        self._buffer = _VertexBuffer()
         self.bind(color=lambda instr, value: setattr(self._color, 'rgba', value))
         return [self._color, self._mesh]
 
@@ -1622,48 +2184,30 @@ class BarPlot(Plot):
         point_len = len(points)
         mesh = self._mesh
         mesh.mode = 'triangles'
-        vert = mesh.vertices
-        ind = mesh.indices
-        diff = len(points) * 6 - len(vert) // 4
-        if diff < 0:
-            del vert[4 * point_len:]
-            del ind[point_len:]
-        elif diff > 0:
-            ind.extend(range(len(ind), len(ind) + diff))
-            vert.extend([0] * (diff * 4))
+        vert = self._buffer.vertices(point_len * 6)
 
         bounds = self.get_px_bounds()
         x_px = self.x_px()
-        y_px = self.y_px()
-        ymin = y_px(0)
+        y1 = self.y_px()(0)
 
         bar_width = self.bar_width
         if bar_width < 0:
             bar_width = x_px(bar_width) - bounds["xmin"]
 
-        for k in range(point_len):
-            p = points[k]
-            x1 = x_px(p[0])
+        x1 = self.project([p[0] for p in points], 'x')
+        y2 = self.project([p[1] for p in points], 'y')
+        if np is not None:
             x2 = x1 + bar_width
-            y1 = ymin
-            y2 = y_px(p[1])
-
-            idx = k * 24
-            # first triangle
-            vert[idx] = x1
-            vert[idx + 1] = y2
-            vert[idx + 4] = x1
-            vert[idx + 5] = y1
-            vert[idx + 8] = x2
-            vert[idx + 9] = y1
-            # second triangle
-            vert[idx + 12] = x1
-            vert[idx + 13] = y2
-            vert[idx + 16] = x2
-            vert[idx + 17] = y2
-            vert[idx + 20] = x2
-            vert[idx + 21] = y1
-        mesh.vertices = vert
+        else:
+            x2 = [x + bar_width for x in x1]
+
+        # two triangles per bar, 6 vertices of 4 floats
+        for offset, values in ((0, x1), (1, y2), (4, x1), (5, y1), (8, x2),
+                               (9, y1), (12, x1), (13, y2), (16, x2),
+                               (17, y2), (20, x2), (21, y1)):
+            _write_column(vert, offset, 24, point_len, values)
+        mesh.vertices = self._buffer.view(point_len * 6)
+        mesh.indices = self._buffer.indices(point_len * 6)
 
     def _unbind_graph(self, graph):
         graph.unbind(width=self.update_bar_width,
@@ -1693,21 +2237,11 @@ class HBar(MeshLinePlot):
     '''
 
     def plot_mesh(self, *args):
-        points = self.points
-        mesh, vert, ind = self.set_mesh_size(len(points) * 2)
-        mesh.mode = "lines"
-
+        self.mode = "lines"
         bounds = self.get_px_bounds()
-        px_xmin = bounds["xmin"]
-        px_xmax = bounds["xmax"]
-        y_px = self.y_px()
-        for k, y in enumerate(points):
-            y = y_px(y)
-            vert[k * 8] = px_xmin
-            vert[k * 8 + 1] = y
-            vert[k * 8 + 4] = px_xmax
-            vert[k * 8 + 5] = y
-        mesh.vertices = vert
+        y = self.project(self.points, 'y')
+        self.set_vertices(_interleave(bounds["xmin"], bounds["xmax"], len(y)),
+                          _interleave(y, y))
 
 
 class VBar(MeshLinePlot):
@@ -1715,21 +2249,11 @@ class VBar(MeshLinePlot):
     '''
 
     def plot_mesh(self, *args):
-        points = self.points
-        mesh, vert, ind = self.set_mesh_size(len(points) * 2)
-        mesh.mode = "lines"
-
+        self.mode = "lines"
         bounds = self.get_px_bounds()
-        px_ymin = bounds["ymin"]
-        px_ymax = bounds["ymax"]
-        x_px = self.x_px()
-        for k, x in enumerate(points):
-            x = x_px(x)
-            vert[k * 8] = x
-            vert[k * 8 + 1] = px_ymin
-            vert[k * 8 + 4] = x
-            vert[k * 8 + 5] = px_ymax
-        mesh.vertices = vert
+        x = self.project(self.points, 'x')
+        self.set_vertices(_interleave(x, x),
+                          _interleave(bounds["ymin"], bounds["ymax"], len(x)))
 
 class _LegendSymbol(Widget):
     
@@ -1,28 +1,66 @@
 # -*- coding: utf-8 -*-
 
 import math as m
+from itertools import compress
+from operator import neg
 
-def list_transformation_log (values): 
-    """Crée une liste du logarithme népérien de chaque valeur 
-    d'une liste.
-        
+import profiling
+
+#Conventions de signe du courant acceptées par `log_transform` : valeur 
+#absolue, courants positifs (oxydation) ou négatifs (réduction)
+POLARITIES = ('abs', 1, -1)
+
+def log_mask(t, I, polarity='abs'):
+    """Indique pour chaque point s'il peut passer au logarithme : t 
+    strictement positif et I non nul et du signe attendu.
+    
     Paramètres
     ----------
-    values : list
-        Tableau de valeurs
-
+    t : list
+        Tableau de valeurs des temps.
+    I : list
+        Tableau de valeurs des intensités.
+    polarity : 'abs', 1 or -1
+        'abs' garde toutes les intensités non nulles (leur valeur absolue est
+        utilisée), 1 les intensités positives et -1 les négatives.
+    
     Retour
     ------
-    loglist : list
-        Tableau de valeurs log
+    mask : bytearray
+        1 pour les points valides, 0 pour les points exclus (valeurs nulles,
+        de mauvais signe ou NaN).
+    """
+    if polarity == 'abs':
+        return bytearray(tv > 0 and abs(Iv) > 0 for tv, Iv in zip(t, I))
+    if polarity == 1:
+        return bytearray(tv > 0 and Iv > 0 for tv, Iv in zip(t, I))
+    if polarity == -1:
+        return bytearray(tv > 0 and Iv < 0 for tv, Iv in zip(t, I))
+    raise ValueError("polarité inconnue : {!r}".format(polarity))
 
+def log_transform(t, I, polarity='abs'):
+    """Calcule le logarithme népérien de t et de I (selon la convention de 
+    signe `polarity`, voir `log_mask`) pour les seuls points valides, sans 
+    lever d'exception sur les autres.
+    
+    Retour
+    ------
+    logt : list
+        Logarithme des temps valides.
+    logI : list
+        Logarithme des intensités valides, au signe près.
+    mask : bytearray
+        Masque des points valides : `mask.count(0)` est le nombre de points 
+        exclus.
     """
-    loglist=list()
-    #on élimine la première valeur du tableau car elle 
-    #correspond à t=0 dont on ne peut pas prendre le log
-    for val in values[1:]: 
-        loglist.append(m.log(val))
-    return (loglist)
+    mask = log_mask(t, I, polarity)
+    logt = list(map(m.log, compress(t, mask)))
+    values = compress(I, mask)
+    if polarity == 'abs':
+        values = map(abs, values)
+    elif polarity == -1:
+        values = map(neg, values)
+    return logt, list(map(m.log, values)), mask
 
 def mean (liste):
     """Calcule la moyenne d'une liste.
@@ -32,12 +70,89 @@ def mean (liste):
     mean = summ/(len(liste))
     return (mean)
 
+#Nombre d'intervalles de log(t) utilisés par `log_binning` par défaut
+LOG_BINS = 200
+
+def log_binning(logt, logI, bins=LOG_BINS):
+    """Regroupe les points `(logt, logI)` en `bins` intervalles de même 
+    largeur en log(t), en un seul parcours des tableaux.
+    
+    Les acquisitions étant échantillonnées régulièrement en t, les temps 
+    longs comptent bien plus de points que les temps courts en log(t). Les 
+    moyennes par intervalle donnent le même poids à chaque portion de 
+    l'échelle logarithmique, avec beaucoup moins de points.
+    
+    Paramètres
+    ----------
+    logt : list
+        Tableau de valeurs log du temps, croissantes ou non.
+    logI : list
+        Tableau de valeurs log de l'intensité.
+    bins : int
+        Nombre d'intervalles.
+    
+    Retour
+    ------
+    meant : list
+        Moyenne de log(t) dans chaque intervalle non vide.
+    meanI : list
+        Moyenne de log(I) dans chaque intervalle non vide.
+    counts : list
+        Nombre de points de chaque intervalle non vide.
+    """
+    if not len(logt):
+        return [], [], []
+    tmin = min(logt)
+    width = (max(logt)-tmin)/bins
+    if width == 0:
+        width = 1.
+    counts = [0]*bins
+    sumt = [0.]*bins
+    sumI = [0.]*bins
+    last = bins-1
+    for t, I in zip(logt, logI):
+        k = int((t-tmin)/width)
+        if k > last:
+            k = last
+        counts[k] += 1
+        sumt[k] += t
+        sumI[k] += I
+    
+    meant, meanI, nonempty = [], [], []
+    for count, st, sI in zip(counts, sumt, sumI):
+        if count:
+            meant.append(st/count)
+            meanI.append(sI/count)
+            nonempty.append(count)
+    return meant, meanI, nonempty
+
+def linear_fit(x, y):
+    """Ajuste une droite sur les points `(x, y)` par les moindres carrés.
+    
+    Retour
+    ------
+    linearcoefficient : float
+        Coefficient directeur de la droite.
+    intercept : float
+        Ordonnée à l'origine de la droite.
+    """
+    meanx = mean(x)
+    meany = mean(y)
+    linearcoefficient = m.fsum((u-meanx)*(v-meany) for u, v in zip(x, y))\
+        / m.fsum((u-meanx)**2 for u in x)
+    intercept = meany-linearcoefficient*meanx
+    return (linearcoefficient, intercept)
+
 class LinearRegression:
     """Permet d'effectuer la régression linéaire sur les valeurs 
     expérimentales.
+    
+    Les tableaux peuvent être stockés en simple précision (`array('f')`) : 
+    chaque valeur est convertie en `float` et les sommes sont faites en double
+    précision avec `math.fsum`.
     """
 
-    def __init__(self, t, I):
+    def __init__(self, t, I, polarity='abs'):
         """
         Paramètres
         ----------
@@ -45,16 +160,22 @@ class LinearRegression:
             Tableau de valeurs des temps expérimentaux.
         I : list
             Tableau de valeurs des intensités mesurées expérimentalement.
+        polarity : 'abs', 1 or -1
+            Convention de signe du courant, voir `log_mask`.
         """
         self.t=t
         self.I=I
+        self.polarity=polarity
+        self.excluded=0
         self.Dexp=0
         
     F = 96485.3329  #Constante de Faraday
     
     def logexp_curves_tab(self, expt, expI):
         """Calcule les listes des valeurs logarithmiques des 
-        listes du temps et de l'intensité.
+        listes du temps et de l'intensité. Les points qui ne peuvent pas 
+        passer au logarithme (t nul, I nul ou de mauvais signe) sont exclus, 
+        leur nombre est gardé dans `excluded`.
         
         Paramètres
         ----------
@@ -64,9 +185,12 @@ class LinearRegression:
              Tableau de valeurs des intensités expérimentales.
         
         """
-        self.logexpt= list_transformation_log(expt)
-        self.logexpI= list_transformation_log(expI)
+        self.logexpt, self.logexpI, mask = log_transform(expt, expI, 
+                                                         self.polarity)
+        self.excluded = mask.count(0)
     
+    @profiling.timed("LinearRegression.linregress", 
+                     points=lambda result, self: len(self.logexpt))
     def linregress (self):
         """Calcule, à l'aide de formules mathématiques et 
         par le modèle des moindres carrés, le coefficient directeur et 
@@ -80,12 +204,26 @@ class LinearRegression:
             Ordonnée à l'origine de la droite de régression linéaire.
         
         """
-        meant = mean(list_transformation_log(self.t))
-        meanI = mean(list_transformation_log(self.I))
-        linearcoefficient = m.fsum( (t-meant)*(I-meanI) for t,I in zip(self.logexpt,self.logexpI) )\
-            / ( m.fsum(((t)-meant)**2 for t in self.logexpt) ) 
-        intercept = meanI-linearcoefficient*meant
-        return(linearcoefficient,intercept)
+        return linear_fit(self.logexpt, self.logexpI)
+        
+    @profiling.timed("LinearRegression.linregress_binned", 
+                     points=lambda result, self, bins=LOG_BINS: len(self.logexpt))
+    def linregress_binned (self, bins=LOG_BINS):
+        """Comme `linregress`, mais la droite est ajustée sur les moyennes
+        par intervalle de log(t) calculées par `log_binning` : chaque 
+        intervalle a le même poids, quel que soit son nombre de points. Les
+        moyennes sont gardées dans `binnedt` et `binnedI`.
+        
+        Retour
+        ------
+        linearcoefficient : float
+            Coefficient directeur de la droite de régression linéaire.
+        intercept : float
+            Ordonnée à l'origine de la droite de régression linéaire.
+        """
+        self.binnedt, self.binnedI = log_binning(self.logexpt, self.logexpI, 
+                                                 bins)[:2]
+        return linear_fit(self.binnedt, self.binnedI)
         
     def logexp_and_linear_curves_tab (self, expt, expI):
         """Calcule la liste des valeurs de la droite de régression 
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
 import os
+import time
+
+#Début du démarrage, pour le rapport des temps de démarrage
+_STARTUP_TIME = time.perf_counter()
 
 import kivy
 kivy.require('1.10.1')
@@ -9,6 +13,7 @@ from kivy.core.window import Window
 from kivy.config import Config
 from kivy.base import EventLoop
 from kivy.lang.builder import Builder
+from kivy.lang.parser import ParserException
 from kivy.properties import ObjectProperty, BooleanProperty, NumericProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.widget import Widget
@@ -16,19 +21,43 @@ from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.button import Button
 from kivy.uix.settings import Settings
+from kivy.logger import Logger
+from kivy.clock import Clock
 
 from kivymd.theming import ThemeManager
 
 from data_reader import DataReader
+from shared_store import SharedAcquisitionStore
 from tab_operations import TabOperations
+from linear_regression import POLARITIES, log_mask
+from baseline import estimate_correction
+from step_detection import detect_segments
 from graphs.cottrell_graph_kivy import CottrellGraph
-from graphs.linearRegress_graph_kivy import GraphLinearRegression
-from components.file_chooser import OpenDialog
-from components.cox_popup import CoxPopup
 from components.interval_popup import IntervalPopup
 from components.errorpopup import ErrorPopup
-from components.settingthemepicker import SettingThemePicker
 import cottrell.cottrell_math as cm
+import profiling
+import kv_bundle
+
+#Les modules rarement utilisés (graphiques d'analyse, popup Cox, sélection 
+#de fichier, choix des couleurs, double saut) ne sont pas importés ici mais 
+#dans les méthodes qui les utilisent (`create_linear_regression_graph`, 
+#`on_cox_button_active`, `show_openDialog`, `build_settings`, 
+#`add_reverse_step`), afin d'accélérer le démarrage.
+
+#Les temps de dessin et de mise à jour des graphiques sont mesurés lorsque
+#`profiling` est activé
+profiling.instrument_garden_graph()
+
+#Valeurs du paramètre « Signe du courant » et conventions de signe 
+#correspondantes (voir `linear_regression.log_mask`)
+POLARITY_LABELS = dict(zip(("valeur absolue", "positif", "négatif"), 
+                           POLARITIES))
+
+#Valeurs du paramètre « Graphique d'analyse »
+ANALYSIS_COTTRELL = "Cottrell : log(I) = f(log(t))"
+ANALYSIS_ANSON = "Anson : Q = f(√t)"
+ANALYSIS_INVERSE_SQRT = "Cottrell : I = f(1/√t)"
 
 Config.read('config.ini')
 # set config
@@ -105,14 +134,24 @@ class MainWindow(Widget):
         self.buttonC.max_value=self.valMaxC
         self.buttonC.steps=self.stepsC
         
+        #Mémoire partagée contenant les valeurs expérimentales brutes, lisible
+        #sans copie par les processus de calcul
+        self.store = SharedAcquisitionStore()
         #tableau de valeurs expérimentales non traité (gardé en mémoire)
         self.exptRaw=None
         self.expIRaw=None
         #tableau de valeurs exp traité suivant l'intervalle sélectionné
         self.expt = None
         self.expI = None
+        #segments de l'acquisition, un par saut de potentiel
+        self.segments = []
+        #résultat de l'analyse d'un double saut de potentiel
+        self.doubleStep = None
         #valeur à ajouter aux I du tableau en cas de problème 
         self.correctI = 0
+        #Vrai si `correctI` a été saisie par l'utilisateur : elle n'est alors
+        #plus estimée automatiquement
+        self.correctI_manual = False
         
         self.mainGraph = CottrellGraph()
         
@@ -161,6 +200,17 @@ class MainWindow(Widget):
             interval_popup.intervalbox.val_min=self.valIntervalMin
             interval_popup.intervalbox.val_max=self.valIntervalMax
             interval_popup.intervalbox.correction_I = self.correctI
+            if not self.correctI_manual:
+                #Propose la correction annulant le courant résiduel estimé 
+                #sur les valeurs actuelles (déjà corrigées de `correctI`)
+                try:
+                    interval_popup.intervalbox.correction_I = (
+                            self.correctI + estimate_correction(self.expt, 
+                                                                self.expI))
+                    interval_popup.intervalbox.correction_I_estimated = True
+                except (ValueError, ZeroDivisionError):
+                    pass
+            self._proposed_correctI = interval_popup.intervalbox.correction_I
             interval_popup.intervalbox.update_display_val()
             interval_popup.bind(on_dismiss=self.on_interval_popup_closed)
             interval_popup.open()
@@ -173,6 +223,8 @@ class MainWindow(Widget):
             self.valIntervalMin=popup.intervalbox.val_min
             self.valIntervalMax=popup.intervalbox.val_max
             self.correctI = popup.intervalbox.correction_I
+            if self.correctI != self._proposed_correctI:
+                self.correctI_manual = True
             self.set_exp_tab_interval()
             self.set_correction_I()
 
@@ -189,11 +241,10 @@ class MainWindow(Widget):
             self.mainGraph.update()
             
             if not hasattr(self, 'graphLinearRegression') and self.ids['dCurveCheckBox'].active:
-                if self.expt and min(self.expI)>0:
-                    self.graphLinearRegression = GraphLinearRegression(self.valN, self.valS, self.valC, 
-                                                                       self.expt, self.expI)
+                if self.regression_possible():
+                    self.graphLinearRegression = self.create_linear_regression_graph()
             if hasattr(self, 'graphLinearRegression'):
-                if self.expt and min(self.expI)>0:
+                if self.regression_possible():
                     if self.graphLinearRegression.get_canvas() not in self.curveBoxLayout.children:
                         self.curveBoxLayout.clear_widgets()
                         self.curveBoxLayout.add_widget(self.graphLinearRegression.get_canvas())
@@ -201,16 +252,15 @@ class MainWindow(Widget):
                     self.graphLinearRegression.I = self.expI
                     self.graphLinearRegression.update()
                 else:
-                    self.curveBoxLayout.clear_widgets()
-                    self.curveBoxLayout.add_widget(Label(text="""[color=FF0000]Attention !
-Les données expérimentales contiennent des valeurs négatives ou nulles.
-Veuillez les enlever avec le bouton[/color] [color=000000]«Sélectionner l'intervalle de travail»[/color]""",
-                    markup=True, halign='center', valign='center', font_size=20))
+                    self.show_regression_error()
         else :
             ErrorPopup("L'intervalle doit être contenu entre {}s et {}s.\n\
 Les valeurs sont inchangées.".format(mintexp, maxtexp)).open()
                                                                                                                                          
     def on_cox_button_active(self,instance):
+        App.get_running_app().load_theme_kv("components/cox_popup-{}.kv")
+        from components.cox_popup import CoxPopup
+        
         cox_popup=CoxPopup()
         cox_popup.CoxvalDth=self.valDth
         cox_popup.CoxvalS=self.valS
@@ -234,16 +284,12 @@ Les valeurs sont inchangées.".format(mintexp, maxtexp)).open()
         """
         if active:
             self.curveBoxLayout.clear_widgets()
-            if self.expt and min(self.expI)>0:
-                self.graphLinearRegression = GraphLinearRegression(self.valN, self.valS, self.valC, 
-                                                                   self.expt, self.expI)
+            if self.regression_possible():
+                self.graphLinearRegression = self.create_linear_regression_graph()
                 self.graphLinearRegression.update()
                 self.curveBoxLayout.add_widget(self.graphLinearRegression.get_canvas())
             else:
-                self.curveBoxLayout.add_widget(Label(text="""[color=FF0000]Attention !
-Les données expérimentales contiennent des valeurs négatives ou nulles.
-Veuillez les enlever avec le bouton[/color] [color=000000]«Sélectionner l'intervalle de travail»[/color]""",
-                    markup=True, halign='center', valign='center', font_size=20))
+                self.show_regression_error()
             self.mainGraph.legend = False
             self.mainGraph.ticks_labels = False
             self.smallCurveBoxLayout.clear_widgets()
@@ -261,6 +307,69 @@ Veuillez les enlever avec le bouton[/color] [color=000000]«Sélectionner l'inte
             self.mainGraph.update()
             self.curveBoxLayout.add_widget(self.mainGraph.get_canvas())
     
+    def create_linear_regression_graph(self):
+        """Crée le graphique de régression linéaire pour les valeurs 
+        expérimentales actuelles : régression log-log de Cottrell, droite 
+        de Cottrell I = f(1/√t) ou droite d'Anson, suivant le graphique 
+        d'analyse choisi dans les paramètres.
+        """
+        mode = self.get_analysis_mode()
+        if mode == ANALYSIS_ANSON:
+            from graphs.anson_graph_kivy import GraphAnson
+            
+            return GraphAnson(self.valN, self.valS, self.valC, 
+                              self.expt, self.expI)
+        if mode == ANALYSIS_INVERSE_SQRT:
+            from graphs.inverse_sqrt_graph_kivy import GraphInverseSqrt
+            
+            return GraphInverseSqrt(self.valN, self.valS, self.valC, 
+                                    self.expt, self.expI)
+        
+        from graphs.linearRegress_graph_kivy import GraphLinearRegression
+        
+        binned = App.get_running_app().config.getboolean('Analyse', 
+                                                         'log_binning')
+        return GraphLinearRegression(self.valN, self.valS, self.valC, 
+                                     self.expt, self.expI, binned, 
+                                     self.get_polarity())
+    
+    def get_polarity(self):
+        """Retourne la convention de signe du courant choisie dans les 
+        paramètres, voir `linear_regression.log_mask`.
+        """
+        polarity = App.get_running_app().config.get('Analyse', 'polarity')
+        return POLARITY_LABELS.get(polarity, 'abs')
+    
+    def get_analysis_mode(self):
+        """Retourne le graphique d'analyse choisi dans les paramètres.
+        """
+        return App.get_running_app().config.get('Analyse', 'mode')
+    
+    def regression_possible(self):
+        """Indique si au moins deux points expérimentaux peuvent passer au 
+        logarithme avec la convention de signe choisie (pour la droite 
+        d'Anson, s'il y a au moins deux points, et pour la droite 
+        I = f(1/√t), s'il y a au moins deux points à t > 0).
+        """
+        mode = self.get_analysis_mode()
+        if mode == ANALYSIS_ANSON:
+            return len(self.expt) >= 2
+        if mode == ANALYSIS_INVERSE_SQRT:
+            return sum(1 for time in self.expt if time > 0) >= 2
+        return log_mask(self.expt, self.expI, 
+                        self.get_polarity()).count(1) >= 2
+    
+    def show_regression_error(self):
+        """Remplace le graphique de régression linéaire par un message 
+        d'erreur.
+        """
+        self.curveBoxLayout.clear_widgets()
+        self.curveBoxLayout.add_widget(Label(text="""[color=FF0000]Attention !
+Les données expérimentales ne contiennent pas assez de valeurs du signe attendu.
+Veuillez changer l'intervalle avec le bouton[/color] [color=000000]«Sélectionner l'intervalle de travail»[/color]
+[color=FF0000]ou le signe du courant dans les paramètres.[/color]""",
+            markup=True, halign='center', valign='center', font_size=20))
+    
     def on_theme_colors(self, *args):
         """Appelé lors de la modification des couleurs du thème.
         """
@@ -327,7 +436,10 @@ La valeur de {0} utilisée pour le graphique est inchangée."
             
         self.I = cm.cottrell_curve_gen(self.valN,self.valS, self.valC, self.valDth, self.t)
         
-        self.mainGraph.I=self.I
+        self.mainGraph.set_theoric_data(self.t, self.I)
+        self.mainGraph.set_n(self.valN)
+        self.mainGraph.set_S(self.valS)
+        self.mainGraph.set_C(self.valC)
         self.mainGraph.update()
         
         if hasattr(self, 'graphLinearRegression'):
@@ -342,6 +454,9 @@ La valeur de {0} utilisée pour le graphique est inchangée."
     def show_openDialog(self):
         """Affiche la boite de dialogue d'ouverture de fichier.
         """
+        App.get_running_app().load_theme_kv("components/file_chooser-{}.kv")
+        from components.file_chooser import OpenDialog
+        
         content = OpenDialog()
         self._openPopup = Popup(title="Sélectionnez le fichier de données :",
                                 content=content, size_hint=(0.7, 0.7))
@@ -350,11 +465,15 @@ La valeur de {0} utilisée pour le graphique est inchangée."
         self._openPopup.open()
     
     def load_data_from_dialog(self, path, filename):
+        #Les fichiers sélectionnés en plus du premier sont superposés
+        others = []
         if isinstance(filename, (list, tuple)):
             if filename:
-                filename = filename[0]
+                filename, others = filename[0], filename[1:]
         if filename:
             err = self.load_exp_data(path, filename)
+            if err is None:
+                err = self.load_acquisitions(path, others)
             if err is None:
                 self._openPopup.dismiss()
             else:
@@ -385,7 +504,9 @@ du fichier !\n\n"+str(err)).open()
         Retourne None si la lecture s'est bien passée, retourne l'erreur sinon.
         """
         try:
-            reader = DataReader(os.path.join(path, filename))
+            reader = DataReader(os.path.join(path, filename), 
+                                store=self.store, key="exp", 
+                                dtype=self.get_storage_dtype())
         except FileNotFoundError as err:
             print(err)
             return err
@@ -400,12 +521,32 @@ du fichier !\n\n"+str(err)).open()
         self.expIRaw = reader.get_I()
         self.expt = self.exptRaw
         self.expI = self.expIRaw
+        self.correctI = 0
+        self.correctI_manual = False
+        
+        #Segments suivant chaque saut de potentiel, détectés dans la colonne
+        #de potentiel (fichiers crv) ou dans les pics de courant
+        self.segments = detect_segments(self.exptRaw, self.expIRaw, 
+                                        reader.get_E())
             
-        #Pour la modification d'intervalle
-        self.valIntervalMin = (min(self.expt))
-        self.valIntervalMax = (max(self.expt))
+        #Pour la modification d'intervalle : le premier segment s'il y en a 
+        #un, toute l'acquisition sinon
+        if self.segments:
+            self.valIntervalMin, self.valIntervalMax = \
+                    self.segments[0].interval(self.exptRaw)
+            self.set_exp_tab_interval()
+        else:
+            self.valIntervalMin = (min(self.expt))
+            self.valIntervalMax = (max(self.expt))
         
         self.mainGraph.set_experimental_data(self.expt, self.expI)
+        self.mainGraph.clear_acquisitions()
+        
+        #Double saut de potentiel : le retour est superposé à l'aller, avec 
+        #sa propre origine des temps
+        self.doubleStep = None
+        if len(self.segments) >= 2:
+            self.add_reverse_step()
         
         #Recalcule les valeurs théoriques pour coller avec l'étendue des valeurs
         #expérimentales
@@ -419,6 +560,58 @@ du fichier !\n\n"+str(err)).open()
         self.expDataLoaded=True
         
         return None
+    
+    def add_reverse_step(self):
+        """Analyse les deux premiers segments de l'acquisition comme un double
+        saut de potentiel et superpose le retour à la courbe expérimentale.
+        """
+        from segmentation import SegmentView, analyse_double_step
+        
+        self.doubleStep = analyse_double_step(self.exptRaw, self.expIRaw, 
+                                              self.segments, self.store, "exp")
+        reverse = SegmentView(self.exptRaw, self.expIRaw, self.segments[1])
+        label = "Retour"
+        if self.doubleStep.ratio is not None:
+            label += "\n-ir(2τ)/if(τ)={:.3g}".format(self.doubleStep.ratio)
+        self.mainGraph.add_acquisition(reverse.t, reverse.I, label, 
+                                       diffusion=self.doubleStep.D_reverse)
+    
+    def load_acquisitions(self, path, filenames):
+        """Charge les fichiers `filenames` situés dans le dossier `path` et 
+        les superpose à la courbe expérimentale (série de concentrations par 
+        exemple).
+        
+        Les fichiers lisibles sont superposés même si d'autres ne le sont 
+        pas, et le graphique est toujours mis à jour.
+        
+        Retour
+        ------
+        Retourne None si la lecture s'est bien passée, retourne la première 
+        erreur sinon.
+        """
+        errors = []
+        for filename in filenames:
+            try:
+                reader = DataReader(os.path.join(path, filename), 
+                                    dtype=self.get_storage_dtype())
+            except Exception as err:
+                Logger.warning("Acquisitions: {}: {}".format(filename, err))
+                errors.append(err)
+                continue
+            self.mainGraph.add_acquisition(reader.get_t(), reader.get_I(), 
+                                           os.path.basename(filename))
+        if filenames:
+            self.mainGraph.set_limit_interval()
+            self.mainGraph.update()
+        return errors[0] if errors else None
+    
+    def get_storage_dtype(self):
+        """Retourne le type de stockage des acquisitions choisi dans les 
+        paramètres : 'f' (simple précision) ou 'd' (double précision).
+        """
+        float32 = App.get_running_app().config.getboolean('Performances', 
+                                                          'float32')
+        return 'f' if float32 else 'd'
 
 
 class AppApp(App):
@@ -435,6 +628,8 @@ class AppApp(App):
     theme_cls.theme_style = "Dark"
     
     def build(self):
+        self._startup_times = [("imports", time.perf_counter())]
+        self._loaded_kv = set()
         Window.bind(on_keyboard=self.key_input)
         self.register_event_type('on_theme_colors')
         
@@ -444,32 +639,61 @@ class AppApp(App):
         self.theme_cls.theme_style, self.theme_cls.primary_palette,\
             self.theme_cls.accent_palette = config.get('Apparence', 'theme-colors') .split(', ')
         
-        self.load_theme_kv("app-{}.kv")
-        
-        self.load_theme_kv("components/cox_popup-{}.kv")
-        self.load_theme_kv("components/entrypopup-{}.kv")
-        self.load_theme_kv("components/errorpopup-{}.kv")
-        self.load_theme_kv("components/file_chooser-{}.kv")
-        self.load_theme_kv("components/intervalbox-{}.kv")
-        self.load_theme_kv("components/interval_popup-{}.kv")
-        self.load_theme_kv("components/spinbox-{}.kv")
+        #cox_popup et file_chooser sont chargés à leur première utilisation
+        self.load_theme_bundle()
+        self._startup_times.append(("kv", time.perf_counter()))
         
         self.settings_cls = Settings
         
         #print(self.theme_cls.primary_color)
         
         self.root = MainWindow()
+        self._startup_times.append(("MainWindow", time.perf_counter()))
         self.bind(on_theme_colors=self.root.on_theme_colors)
         
         if self.theme == 'material-design':
             self.dispatch('on_theme_colors', config.get('Apparence', 'theme-colors'))
         
+        self._perf_overlay = None
+        self.set_profiling(config.getboolean('Performances', 'profiling'))
+        
         return self.root
     
+    def load_theme_bundle(self):
+        """Charge en une seule fois les fichiers kv de `kv_bundle.KV_FILES`
+        depuis le bundle du thème, reconstruit dans `user_data_dir` si les
+        fichiers sources ont changé. En cas d'échec, les fichiers sont chargés
+        un par un ; un bundle du cache qui ne peut pas être lu est supprimé 
+        pour être reconstruit au prochain lancement.
+        """
+        cache_dir = os.path.join(self.user_data_dir, "kv_bundles")
+        try:
+            bundle = kv_bundle.get_bundle(self.theme, cache_dir)
+            try:
+                Builder.load_file(bundle)
+            except ParserException:
+                #Les règles déjà appliquées sont retirées avant de charger les
+                #fichiers un par un
+                Builder.unload_file(bundle)
+                if os.path.dirname(os.path.abspath(bundle)) == \
+                   os.path.abspath(cache_dir):
+                    os.remove(bundle)
+                raise
+        except (OSError, ParserException) as err:
+            Logger.warning("KvBundle: {}".format(err))
+            for path in kv_bundle.KV_FILES:
+                self.load_theme_kv(path)
+        else:
+            self._loaded_kv.update(kv_bundle.KV_FILES)
+    
     def load_theme_kv(self, path):
         """
         path must be similar to "/optional/mywidget{}.kv" to be parsed by format.
+        Each path is only loaded once.
         """
+        if path in self._loaded_kv:
+            return
+        self._loaded_kv.add(path)
         try:
             Builder.load_file(path.format(self.theme))
         except FileNotFoundError as err:
@@ -484,13 +708,22 @@ Chargement du fichier kv par défaut.""".format(path.format(self.theme), err))
         config.setdefaults('Apparence', {'theme-colors': '{}, {}, {}'.format(
                 self.theme_cls.theme_style, self.theme_cls.primary_palette, 
                 self.theme_cls.accent_palette),})
+        config.setdefaults('Performances', {'profiling': '0', 'float32': '0'})
+        config.setdefaults('Analyse', {'mode': ANALYSIS_COTTRELL, 
+                                       'log_binning': '0', 
+                                       'polarity': 'valeur absolue'})
 
     def build_settings(self, settings):
         """
         Ajoute notre propre section à l'objet de configuration par défaut.
         """
+        from components.settingthemepicker import SettingThemePicker
+        
         settings.register_type('theme-picker', SettingThemePicker)
         settings.add_json_panel('Apparence', self.config, 'settings.json')
+        settings.add_json_panel('Analyse', self.config, 'settings_analyse.json')
+        settings.add_json_panel('Performances', self.config, 
+                                'settings_performances.json')
 
     def on_config_change(self, config, section, key, value):
         """
@@ -503,9 +736,71 @@ Chargement du fichier kv par défaut.""".format(path.format(self.theme), err))
             if key == "theme-colors":
                 if self.theme == 'material-design':
                     self.dispatch('on_theme_colors', value)
+        if section == "Analyse":
+            if key in ("mode", "polarity"):
+                if self.root.ids['dCurveCheckBox'].active:
+                    self.root.on_dCurveCheckBox_active(True)
+            if key == "log_binning":
+                graph = getattr(self.root, 'graphLinearRegression', None)
+                if hasattr(graph, 'set_binned'):
+                    graph.set_binned(value in ('1', True))
+        if section == "Performances":
+            if key == "profiling":
+                self.set_profiling(value in ('1', True))
+    
+    def set_profiling(self, enabled):
+        """Active ou désactive la mesure des performances et son affichage.
+        À la désactivation, la trace est enregistrée dans `trace.json`, dans
+        le dossier de données de l'application.
+        """
+        if enabled:
+            from components.perf_overlay import PerfOverlay
+            
+            profiling.enable()
+            if self._perf_overlay is None:
+                self._perf_overlay = PerfOverlay()
+                Window.add_widget(self._perf_overlay)
+        else:
+            if profiling.is_enabled():
+                self.dump_trace()
+            profiling.enable(False)
+            if self._perf_overlay is not None:
+                Window.remove_widget(self._perf_overlay)
+                self._perf_overlay = None
+    
+    def dump_trace(self):
+        filename = os.path.join(self.user_data_dir, 'trace.json')
+        try:
+            profiling.dump_trace(filename)
+        except OSError as err:
+            Logger.warning("Profiling: impossible d'écrire {} : {}".format(
+                    filename, err))
+        else:
+            Logger.info("Profiling: trace enregistrée dans {}".format(filename))
+    
+    def on_stop(self):
+        if profiling.is_enabled():
+            self.dump_trace()
+        self.root.store.close()
     
     def on_theme_colors(self, *args):
         pass
+    
+    def on_start(self):
+        #La première image est affichée au prochain tour de boucle
+        Clock.schedule_once(self.report_startup_times)
+    
+    def report_startup_times(self, *args):
+        """Affiche dans le journal la durée de chaque étape du démarrage.
+        """
+        self._startup_times.append(("first frame", time.perf_counter()))
+        previous = _STARTUP_TIME
+        steps = []
+        for name, instant in self._startup_times:
+            steps.append("{} {:.0f} ms".format(name, (instant-previous)*1000))
+            previous = instant
+        Logger.info("Startup: {} (total {:.0f} ms)".format(
+                ", ".join(steps), (previous-_STARTUP_TIME)*1000))
 
     def close_settings(self, settings=None):
         """
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Mesure des temps d'exécution des parties critiques de l'application.
+
+Les mesures sont désactivées par défaut et ne coûtent alors qu'un test par 
+appel. Une fois activées (`enable()`), chaque mesure met à jour des 
+statistiques (dernière durée, moyenne, nombre de points traités) et est 
+ajoutée à une trace qui peut être enregistrée avec `dump_trace()` au format
+« Trace Event » de Chrome, lisible par `chrome://tracing` ou Perfetto.
+
+Utilisation :
+    `with profiling.timer("DataReader") as timer:
+        ...
+        timer.points = len(values)`
+ou
+    `@profiling.timed("cottrell_curve_gen", points=lambda result, *args: len(result))`
+"""
+
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+#Nombre maximal d'évènements conservés dans la trace
+MAX_TRACE_EVENTS = 100000
+
+_enabled = False
+_stats = {}
+_trace = []
+_origin = time.perf_counter()
+
+class Stat:
+    """Statistiques d'une mesure.
+    """
+    __slots__ = ("count", "total", "last", "points")
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.
+        self.last = 0.
+        self.points = None
+    
+    @property
+    def mean(self):
+        return self.total/self.count if self.count else 0.
+
+def enable(enabled=True):
+    """Active (ou désactive si `enabled == False`) les mesures.
+    """
+    global _enabled
+    _enabled = enabled
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    """Efface les statistiques et la trace.
+    """
+    _stats.clear()
+    del _trace[:]
+
+def record(name, start, duration, points=None):
+    """Enregistre une mesure.
+    
+    Paramètres
+    ----------
+    name : str
+        Nom de la mesure.
+    start : float
+        Instant de début, donné par `time.perf_counter()`.
+    duration : float
+        Durée en secondes.
+    points : int
+        Nombre de points traités, optionnel.
+    """
+    stat = _stats.get(name)
+    if stat is None:
+        stat = _stats[name] = Stat()
+    stat.count += 1
+    stat.total += duration
+    stat.last = duration
+    if points is not None:
+        stat.points = points
+    if len(_trace) < MAX_TRACE_EVENTS:
+        event = {"name": name, "ph": "X", "pid": os.getpid(),
+                 "tid": threading.get_ident(),
+                 "ts": (start-_origin)*1e6, "dur": duration*1e6}
+        if points is not None:
+            event["args"] = {"points": points}
+        _trace.append(event)
+
+def stats():
+    """Retourne les statistiques sous la forme d'un dictionnaire 
+    `{nom: Stat}`.
+    """
+    return dict(_stats)
+
+class timer:
+    """Gestionnaire de contexte mesurant la durée de son bloc. Le nombre de
+    points traités peut être donné dans l'attribut `points`.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.points = None
+        
+    def __enter__(self):
+        if _enabled:
+            self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        if _enabled and hasattr(self, "_start"):
+            record(self.name, self._start, time.perf_counter()-self._start,
+                   self.points)
+        return False
+
+def timed(name, points=None):
+    """Décorateur mesurant la durée des appels d'une fonction.
+    
+    Paramètres
+    ----------
+    name : str
+        Nom de la mesure.
+    points : callable
+        Fonction `points(result, *args, **kwargs)` retournant le nombre de 
+        points traités, optionnelle.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            duration = time.perf_counter()-start
+            record(name, start, duration, 
+                   points(result, *args, **kwargs) if points else None)
+            return result
+        wrapper.__wrapped_by_profiling__ = True
+        return wrapper
+    return decorator
+
+def instrument(cls, method, name=None, points=None):
+    """Remplace la méthode `method` de la classe `cls` par sa version 
+    mesurée par `timed`. Sert à mesurer les bibliothèques externes.
+    """
+    func = cls.__dict__[method]
+    if getattr(func, "__wrapped_by_profiling__", False):
+        return
+    setattr(cls, method, timed(name or "{}.{}".format(cls.__name__, method),
+                               points)(func))
+
+def _plot_points(result, plot, *args):
+    return len(plot.points)
+
+def instrument_garden_graph():
+    """Mesure le dessin des courbes et la mise à jour des étiquettes des 
+    graphiques de `kivy.garden.graph`.
+    """
+    from kivy.garden import graph
+    
+    instrument(graph.Graph, "_update_labels")
+    for cls in vars(graph).values():
+        if (isinstance(cls, type) and issubclass(cls, graph.Plot) and 
+                cls is not graph.Plot and "draw" in cls.__dict__):
+            instrument(cls, "draw", points=_plot_points)
+
+def dump_trace(filename):
+    """Enregistre la trace au format « Trace Event » (JSON).
+    """
+    with open(filename, 'w') as file:
+        json.dump({"traceEvents": _trace, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""Découpage d'une acquisition à plusieurs sauts de potentiel et analyse de
+chaque segment.
+
+Chaque segment trouvé par `step_detection.detect_segments` devient une vue
+(`SegmentView`) sur les tableaux de l'acquisition, sans copie, avec sa propre
+origine des temps : l'instant t0 du saut. La régression linéaire de Cottrell
+est faite sur chaque segment, en parallèle pour les grandes acquisitions :
+les processus de calcul lisent les tableaux dans la mémoire partagée
+(`shared_store`) et ne reçoivent que les bornes de leur segment.
+
+Pour un double saut de potentiel (aller puis retour), `analyse_double_step`
+donne les coefficients de diffusion aller et retour et le rapport des
+courants -i_r(2τ)/i_f(τ), τ étant la durée de l'aller. Il vaut
+1 - 1/√2 ≈ 0.293 pour un couple rapide dont les deux espèces sont stables et
+diffusent de la même manière.
+
+Le courant du retour ne suit pas la loi de Cottrell seule : t' étant le temps
+depuis le saut retour,
+    i_r(t') = k.(1/√(t'+τ) - 1/√t')    avec k = n.F.S.C.√(D/π)
+k est ajusté par les moindres carrés (droite passant par l'origine en
+x = 1/√(t'+τ) - 1/√t') pour obtenir le D du retour.
+"""
+
+import math as m
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from linear_regression import LinearRegression, log_transform, linear_fit
+import shared_store
+
+#Nombre total de points à partir duquel les segments sont analysés dans
+#plusieurs processus : en dessous, lancer les processus coûte plus cher que
+#les calculs
+PARALLEL_MIN_POINTS = 200000
+
+class ShiftedView:
+    """Séquence en lecture seule des valeurs de `values` diminuées de
+    `origin`, calculées à la demande.
+    """
+    __slots__ = ("values", "origin")
+
+    def __init__(self, values, origin):
+        self.values = values
+        self.origin = origin
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ShiftedView(self.values[index], self.origin)
+        return self.values[index] - self.origin
+
+    def __iter__(self):
+        origin = self.origin
+        return (value - origin for value in self.values)
+
+def _slice(values, start, stop):
+    #Les tableaux (array, memoryview) sont découpés sans copie
+    try:
+        return memoryview(values)[start:stop]
+    except TypeError:
+        return values[start:stop]
+
+class SegmentView:
+    """Segment d'une acquisition, vu sans copie.
+
+    Attributs
+    ---------
+    segment : step_detection.StepSegment
+        Bornes du segment.
+    t : ShiftedView
+        Temps du segment, à partir de l'instant du saut.
+    I : list-like
+        Intensités du segment.
+    """
+    __slots__ = ("segment", "t", "I")
+
+    def __init__(self, t, I, segment):
+        """
+        Paramètres
+        ----------
+        t : list-like
+            Tableau de valeurs des temps de toute l'acquisition.
+        I : list-like
+            Tableau de valeurs des intensités de toute l'acquisition.
+        segment : step_detection.StepSegment
+            Segment à extraire.
+        """
+        self.segment = segment
+        self.t = ShiftedView(_slice(t, segment.start, segment.stop),
+                             segment.t0)
+        self.I = _slice(I, segment.start, segment.stop)
+
+    def __len__(self):
+        return len(self.I)
+
+    def polarity(self):
+        """Retourne le signe du courant du segment, celui de son premier point
+        (le pic qui suit le saut).
+        """
+        return -1 if len(self.I) and self.I[0] < 0 else 1
+
+class SegmentResult:
+    """Résultat de la régression linéaire de log(I) en fonction de log(t)
+    sur un segment.
+
+    Attributs
+    ---------
+    segment : step_detection.StepSegment
+        Segment analysé.
+    slope, intercept : float or None
+        Coefficient directeur et ordonnée à l'origine de la droite.
+    points : int
+        Nombre de points ajustés.
+    excluded : int
+        Nombre de points exclus (courant nul ou de signe opposé à celui du
+        segment).
+    error : str or None
+        Message d'erreur si la régression n'a pas pu être faite.
+    reverse_k : float or None
+        Pour le retour d'un double saut, coefficient k du courant
+        k.(1/√(t'+τ) - 1/√t').
+    """
+    def __init__(self, segment, slope=None, intercept=None, points=0,
+                 excluded=0, error=None):
+        self.segment = segment
+        self.slope = slope
+        self.intercept = intercept
+        self.points = points
+        self.excluded = excluded
+        self.error = error
+        self.reverse_k = None
+
+    def D(self, n, S, C):
+        """Retourne le coefficient de diffusion du segment, ou None si la
+        régression n'a pas pu être faite.
+        """
+        if self.intercept is None:
+            return None
+        return LinearRegression([], []).calculate_D(self.intercept, n, S, C)
+
+def reverse_step_k(t, I, tau):
+    """Ajuste `I = k.(1/√(t+τ) - 1/√t)` par les moindres carrés, les temps
+    `t` étant comptés depuis le saut retour et `tau` étant la durée de
+    l'aller.
+
+    Retour
+    ------
+    k, ou None s'il n'y a aucun point utilisable.
+    """
+    sxy = []
+    sxx = []
+    for tv, Iv in zip(t, I):
+        if tv > 0:
+            x = 1/m.sqrt(tv + tau) - 1/m.sqrt(tv)
+            sxy.append(x*Iv)
+            sxx.append(x*x)
+    if not sxx:
+        return None
+    return m.fsum(sxy)/m.fsum(sxx)
+
+def analyse_segment(t, I, segment, polarity=None, tau=None):
+    """Fait la régression linéaire de Cottrell sur `segment`.
+
+    Paramètres
+    ----------
+    t, I : list-like
+        Tableaux de toute l'acquisition.
+    segment : step_detection.StepSegment
+        Segment à analyser.
+    polarity : 'abs', 1, -1 or None
+        Convention de signe du courant (voir `linear_regression.log_mask`).
+        Par défaut, le signe du pic qui suit le saut.
+    tau : float or None
+        Si donné, le segment est le retour d'un double saut dont l'aller a
+        duré `tau` : `reverse_k` est aussi calculé (voir `reverse_step_k`).
+
+    Retour
+    ------
+    Un `SegmentResult`.
+    """
+    view = SegmentView(t, I, segment)
+    if polarity is None:
+        polarity = view.polarity()
+    logt, logI, mask = log_transform(view.t, view.I, polarity)
+    result = SegmentResult(segment, points=len(logt), excluded=mask.count(0))
+    try:
+        result.slope, result.intercept = linear_fit(logt, logI)
+    except ZeroDivisionError:
+        result.error = "pas assez de points"
+    if tau is not None:
+        result.reverse_k = reverse_step_k(view.t, view.I, tau)
+    return result
+
+def _analyse_shared(job):
+    #Exécuté dans un processus de calcul
+    t_descriptor, I_descriptor, segment, polarity, tau = job
+    return analyse_segment(shared_store.attach(t_descriptor),
+                           shared_store.attach(I_descriptor), segment,
+                           polarity, tau)
+
+def analyse_segments(t, I, segments, store=None, key=None, polarity=None,
+                     jobs=None, taus=None):
+    """Analyse chaque segment de `segments` (voir `analyse_segment`). 
+    `taus`, optionnel, donne le paramètre `tau` de chaque segment.
+
+    Si `store` et `key` sont donnés, que `store` contient les tableaux de
+    l'acquisition sous les clés "`key`/t" et "`key`/I" (voir `DataReader`)
+    et que l'acquisition est assez grande, les segments sont répartis sur `jobs` processus qui lisent
+    les tableaux en mémoire partagée. Sinon, ou si les processus ne peuvent
+    pas être lancés, ils sont analysés dans le processus courant.
+
+    Retour
+    ------
+    Liste de `SegmentResult`, dans l'ordre de `segments`.
+    """
+    if taus is None:
+        taus = [None]*len(segments)
+    parallel = (store is not None and key is not None and store.shared 
+                and len(segments) > 1 and jobs != 1 
+                and key + "/t" in store and key + "/I" in store
+                and sum(len(segment) for segment in segments)
+                    >= PARALLEL_MIN_POINTS)
+    if parallel:
+        job_args = [(store.descriptor(key + "/t"), store.descriptor(key + "/I"),
+                     segment, polarity, tau)
+                    for segment, tau in zip(segments, taus)]
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                return list(executor.map(_analyse_shared, job_args))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            #Pas de processus disponibles (Android par exemple) ou processus
+            #de calcul interrompu : le calcul est refait ici
+            pass
+    return [analyse_segment(t, I, segment, polarity, tau)
+            for segment, tau in zip(segments, taus)]
+
+class DoubleStepResult:
+    """Résultat de l'analyse d'un double saut de potentiel.
+
+    Attributs
+    ---------
+    forward, reverse : SegmentResult
+        Résultats de l'aller et du retour.
+    ratio : float or None
+        Rapport des courants -i_r(2τ)/i_f(τ), τ étant la durée de l'aller,
+        None s'il ne peut pas être calculé.
+    """
+    def __init__(self, forward, reverse, ratio):
+        self.forward = forward
+        self.reverse = reverse
+        self.ratio = ratio
+
+    def D_forward(self, n, S, C):
+        """Coefficient de diffusion déduit de l'aller (loi de Cottrell).
+        """
+        return self.forward.D(n, S, C)
+
+    def D_reverse(self, n, S, C):
+        """Coefficient de diffusion déduit du retour, D = π.(k/(n.F.S.C))²,
+        ou None s'il ne peut pas être calculé.
+        """
+        k = self.reverse.reverse_k
+        if k is None:
+            return None
+        return m.pi*(k/(n*LinearRegression.F*S*C))**2
+
+def current_ratio(t, I, forward, reverse):
+    """Calcule le rapport -i_r(2τ)/i_f(τ) : i_f(τ) est le courant à la fin
+    de l'aller, de durée τ, et i_r(2τ) le courant τ après le saut retour (ou
+    à la fin du retour s'il dure moins de τ).
+
+    Retour
+    ------
+    Le rapport, ou None si i_f(τ) est nul.
+    """
+    tau = t[forward.stop - 1] - forward.t0
+    i_f = I[forward.stop - 1]
+    k = bisect_left(SegmentView(t, I, reverse).t, tau)
+    i_r = I[min(reverse.start + k, reverse.stop - 1)]
+    if i_f == 0:
+        return None
+    return -i_r/i_f
+
+def analyse_double_step(t, I, segments, store=None, key=None, jobs=None):
+    """Analyse les deux premiers segments de `segments` comme l'aller et le
+    retour d'un double saut de potentiel.
+
+    Retour
+    ------
+    Un `DoubleStepResult`.
+
+    Lève une `ValueError` s'il y a moins de deux segments.
+    """
+    if len(segments) < 2:
+        raise ValueError("un double saut nécessite deux segments")
+    forward, reverse = analyse_segments(
+            t, I, segments[:2], store, key, jobs=jobs,
+            taus=[None, segments[1].t0 - segments[0].t0])
+    return DoubleStepResult(forward, reverse,
+                            current_ratio(t, I, segments[0], segments[1]))
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Stockage des tableaux d'acquisition en mémoire partagée.
+
+Les tableaux (t, I...) d'une acquisition sont écrits une seule fois dans des
+blocs `multiprocessing.shared_memory` : les processus de calcul les lisent
+ensuite sans copie, au travers de `memoryview` typées. Seul un
+« descripteur » (nom du bloc, longueur, type) est transmis aux processus.
+L'interface garde ses propres tableaux (voir `DataReader`) : un bloc ne peut
+être fermé que lorsque plus aucune vue du processus ne l'utilise.
+
+Lorsque la mémoire partagée n'est pas disponible (Python < 3.8, Android qui
+n'a pas de /dev/shm), les tableaux sont gardés dans le processus courant sous
+forme de `array.array` ; les descripteurs contiennent alors une copie des
+données, ce qui reste fonctionnel.
+
+Utilisation :
+    `store = SharedAcquisitionStore()
+    t = store.put("exp/t", values)
+    ...
+    pool.submit(work, store.descriptor("exp/t"))  #dans le processus parent
+    t = shared_store.attach(descriptor)            #dans le processus fils`
+"""
+
+import array
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+class SharedAcquisitionStore:
+    """Registre de tableaux nommés, en mémoire partagée si possible.
+    """
+    def __init__(self, shared=None):
+        """
+        Paramètres
+        ----------
+        shared : bool or None
+            Utilise la mémoire partagée si `True`, des tableaux locaux si
+            `False`. Par défaut, la mémoire partagée est utilisée si elle est
+            disponible.
+        """
+        self.shared = shared_memory is not None if shared is None else shared
+        #clé -> (bloc de mémoire partagée ou tableau local, vue)
+        self._blocks = {}
+        #Blocs libérés dont des vues distribuées sont encore utilisées
+        self._released = []
+
+    def create(self, key, length, typecode='d'):
+        """Crée un tableau de `length` valeurs de type `typecode` (au sens du
+        module `array`) associé à `key`, en remplaçant l'éventuel tableau
+        existant.
+
+        Retour
+        ------
+        Vue (`memoryview`) modifiable sur le tableau.
+        """
+        self.release(key)
+        nbytes = length*array.array(typecode).itemsize
+        block = None
+        if self.shared:
+            try:
+                block = shared_memory.SharedMemory(create=True,
+                                                   size=max(nbytes, 1))
+            except OSError:
+                #Mémoire partagée indisponible (pas de /dev/shm)
+                self.shared = False
+        if block is not None:
+            view = block.buf[:nbytes].cast(typecode)
+        else:
+            block = array.array(typecode, bytes(nbytes))
+            view = memoryview(block)
+        self._blocks[key] = (block, view)
+        #Les vues distribuées sont distinctes de celle du registre, qui peut
+        #ainsi être libérée sans les invalider
+        return memoryview(view)
+
+    def put(self, key, values, typecode='d'):
+        """Copie `values` dans un nouveau tableau associé à `key`.
+
+        Retour
+        ------
+        Vue (`memoryview`) sur le tableau.
+        """
+        if not (isinstance(values, array.array) and values.typecode == typecode):
+            values = array.array(typecode, values)
+        view = self.create(key, len(values), typecode)
+        view[:] = memoryview(values)
+        return view
+
+    def get(self, key):
+        """
+        Retour
+        ------
+        Vue sur le tableau associé à `key`.
+        """
+        return memoryview(self._blocks[key][1])
+
+    def __contains__(self, key):
+        return key in self._blocks
+
+    def keys(self):
+        return list(self._blocks)
+
+    def descriptor(self, key):
+        """Retourne un descripteur du tableau associé à `key`, à passer à
+        `attach` dans un autre processus.
+        """
+        block, view = self._blocks[key]
+        if isinstance(block, array.array):
+            return (None, len(view), view.format, block)
+        return (block.name, len(view), view.format)
+
+    def release(self, key):
+        """Supprime le tableau associé à `key`. Les vues déjà distribuées
+        restent valides tant qu'elles sont utilisées : le bloc de mémoire
+        partagée est fermé à un appel suivant de `release` ou de `collect`,
+        une fois qu'elles ont toutes été abandonnées.
+        """
+        block, view = self._blocks.pop(key, (None, None))
+        if view is not None:
+            view.release()
+        if block is not None and not isinstance(block, array.array):
+            block.unlink()
+            self._released.append(block)
+        self.collect()
+
+    def close(self):
+        """Supprime tous les tableaux. Les blocs dont des vues sont encore
+        utilisées restent ouverts jusqu'à la fin du processus.
+        """
+        for key in self.keys():
+            self.release(key)
+
+    def collect(self):
+        """Ferme les blocs libérés dont plus aucune vue n'est utilisée.
+
+        Retour
+        ------
+        Nombre de blocs libérés encore ouverts.
+        """
+        still_used = []
+        for block in self._released:
+            try:
+                block.close()
+            except BufferError:
+                still_used.append(block)
+        self._released = still_used
+        return len(still_used)
+
+#Blocs ouverts par `attach`, gardés ouverts pendant toute la vie du processus
+_attached = {}
+
+def attach(descriptor):
+    """Retourne une vue en lecture sur le tableau décrit par `descriptor`
+    (voir `SharedAcquisitionStore.descriptor`), sans copie si le tableau est
+    en mémoire partagée.
+    """
+    name, length, typecode = descriptor[:3]
+    if name is None:
+        return memoryview(descriptor[3]).toreadonly()
+    block = _attached.get(name)
+    if block is None:
+        #Les processus fils partagent le « resource tracker » du processus
+        #qui a créé le bloc : c'est lui qui le supprime
+        block = shared_memory.SharedMemory(name)
+        _attached[name] = block
+    itemsize = array.array(typecode).itemsize
+    return block.buf[:length*itemsize].cast(typecode).toreadonly()
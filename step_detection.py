@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Détection des sauts de potentiel d'une acquisition.
+
+L'origine des temps de la loi de Cottrell est l'instant t0 du saut de
+potentiel, qui n'est pas forcément le début de l'acquisition. Les fichiers
+crv contiennent le potentiel appliqué : un saut est une variation de plus de
+`POTENTIAL_THRESHOLD` entre deux points consécutifs. Pour les fichiers qui
+n'ont que le courant (csv), un saut est repéré par le pic de courant qui le
+suit : une augmentation brutale de |I|.
+
+Chaque saut ouvre un segment qui s'étend jusqu'au saut suivant ou à la fin
+de l'acquisition ; une acquisition à plusieurs sauts (double saut de
+potentiel par exemple) est ainsi découpée en une seule passe.
+"""
+
+from itertools import islice
+from operator import sub
+
+#Variation minimale du potentiel (V) entre deux points pour un saut
+POTENTIAL_THRESHOLD = 0.01
+#Augmentation minimale de |I| entre deux points pour un pic de courant, en
+#fraction de l'étendue des valeurs de |I|
+SPIKE_FRACTION = 0.5
+#Nombre minimal de points d'un segment
+MIN_POINTS = 5
+
+class StepSegment:
+    """Segment d'une acquisition qui suit un saut de potentiel.
+
+    Attributs
+    ---------
+    start : int
+        Indice du premier point après le saut.
+    stop : int
+        Indice suivant le dernier point du segment.
+    t0 : float
+        Instant du saut : temps du dernier point avant le saut, de sorte que
+        le premier point du segment soit à t0 + pas d'échantillonnage.
+    level : float or None
+        Potentiel appliqué pendant le segment, None s'il n'est pas connu.
+    """
+    __slots__ = ("start", "stop", "t0", "level")
+
+    def __init__(self, start, stop, t0, level=None):
+        self.start = start
+        self.stop = stop
+        self.t0 = t0
+        self.level = level
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def interval(self, t):
+        """Retourne l'intervalle de travail `(tmin, tmax)` correspondant au
+        segment, à passer à `TabOperations.del_values_not_between_tmin_tmax`.
+        """
+        return self.t0, t[self.stop - 1]
+
+    def __repr__(self):
+        return "StepSegment(start={}, stop={}, t0={}, level={})".format(
+                self.start, self.stop, self.t0, self.level)
+
+def find_steps(deltas, threshold, min_points=MIN_POINTS):
+    """Retourne les indices des points qui suivent une variation supérieure
+    à `threshold`, deux indices étant distants d'au moins `min_points`.
+
+    Paramètres
+    ----------
+    deltas : iterable
+        Variations entre points consécutifs : `deltas[k]` est la variation
+        entre les points `k` et `k+1`.
+    threshold : float
+        Variation minimale.
+    min_points : int
+        Nombre minimal de points entre deux sauts : les variations qui
+        suivent un saut de moins de `min_points` points (transitoire du
+        potentiostat par exemple) sont ignorées.
+    """
+    steps = []
+    last = -min_points
+    for k, delta in enumerate(deltas, 1):
+        if delta > threshold and k - last >= min_points:
+            steps.append(k)
+            last = k
+    return steps
+
+def potential_steps(E, threshold=POTENTIAL_THRESHOLD, min_points=MIN_POINTS):
+    """Retourne les indices des premiers points après chaque saut du
+    potentiel `E`.
+    """
+    deltas = map(abs, map(sub, islice(E, 1, None), E))
+    return find_steps(deltas, threshold, min_points)
+
+def current_spikes(I, fraction=SPIKE_FRACTION, min_points=MIN_POINTS):
+    """Retourne les indices des pics de courant de `I` : les points où |I|
+    augmente de plus de `fraction` fois l'étendue des valeurs de |I|.
+    """
+    if len(I) < 2:
+        return []
+    absI = list(map(abs, I))
+    threshold = fraction*(max(absI) - min(absI))
+    if threshold <= 0:
+        return []
+    deltas = map(sub, islice(absI, 1, None), absI)
+    return find_steps(deltas, threshold, min_points)
+
+def segments_from_steps(t, steps, E=None, min_points=MIN_POINTS):
+    """Crée les segments commençant à chaque indice de `steps`. Les segments
+    de moins de `min_points` points sont ignorés.
+
+    Retour
+    ------
+    Liste de `StepSegment`.
+    """
+    segments = []
+    for k, start in enumerate(steps):
+        stop = steps[k + 1] if k + 1 < len(steps) else len(t)
+        if stop - start < min_points:
+            continue
+        level = E[start] if E is not None and len(E) == len(t) else None
+        segments.append(StepSegment(start, stop, t[start - 1], level))
+    return segments
+
+def detect_segments(t, I, E=None, threshold=POTENTIAL_THRESHOLD,
+                    fraction=SPIKE_FRACTION, min_points=MIN_POINTS):
+    """Découpe une acquisition en segments, un par saut de potentiel. Les
+    sauts sont cherchés dans le potentiel `E` s'il est donné, sinon dans les
+    pics du courant `I`.
+
+    Paramètres
+    ----------
+    t : list
+        Tableau de valeurs des temps.
+    I : list
+        Tableau de valeurs des intensités.
+    E : list or None
+        Tableau de valeurs du potentiel appliqué, de même longueur que `t`.
+    threshold : float
+        Variation minimale du potentiel pour un saut (V).
+    fraction : float
+        Voir `current_spikes`.
+    min_points : int
+        Nombre minimal de points d'un segment.
+
+    Retour
+    ------
+    Liste de `StepSegment`, vide si aucun saut n'est trouvé (l'acquisition
+    commence alors au saut de potentiel).
+    """
+    if E is not None and len(E) == len(t) and len(E) > 1:
+        steps = potential_steps(E, threshold, min_points)
+    else:
+        E = None
+        steps = current_spikes(I, fraction, min_points)
+    return segments_from_steps(t, steps, E, min_points)
@@ -1,4 +1,16 @@
 # -*- coding: utf-8 -*-
+from array import array
+
+def typecode(tab):
+    """Retourne le type (au sens du module `array`) des valeurs de `tab` : 
+    celui de `tab` s'il s'agit d'un `array.array` ou d'une `memoryview`, 
+    'd' (double précision) sinon.
+    """
+    if isinstance(tab, array):
+        return tab.typecode
+    if isinstance(tab, memoryview):
+        return tab.format
+    return 'd'
 
 class TabOperations():
     """Cette classe a pour objectif de faire des opérations sur les tableaux des 
@@ -31,17 +43,19 @@ class TabOperations():
     def del_values_not_between_tmin_tmax(expt, expI, tmin, tmax) :           
         """Cette fonction a pour objectif de supprimer les valeurs qui ne sont 
         pas entre `tmin` et `tmax` dans le tableau des valeurs expérimentales.
-        """
-        tab_expt_to_return=[]
-        tab_expI_to_return=[]
         
+        Retour
+        ------
+        Les tableaux (`array.array`) des valeurs de t, décalées pour commencer
+        à t=0, et de I.
+        """
         rank_first = TabOperations.rank_first_t(expt,tmin)
         rank_last = TabOperations.rank_first_t(expt,tmax)
-
-        for i in range(rank_first,rank_last):
-            tab_expt_to_return.append(expt[i]-expt[rank_first]) #On commence à t=0
-            
-        tab_expI_to_return = expI[rank_first : rank_last]
+        
+        t0 = expt[rank_first] if rank_first < len(expt) else 0
+        tab_expt_to_return = array(typecode(expt), 
+                                   (expt[i]-t0 for i in range(rank_first,rank_last))) #On commence à t=0
+        tab_expI_to_return = array(typecode(expI), expI[rank_first : rank_last])
         return tab_expt_to_return, tab_expI_to_return
     
     def add_x_to_tab(tab, x):
@@ -56,12 +70,9 @@ class TabOperations():
         
         Retour
         ------
-        Retourne le tableau modifié.
+        Retourne le tableau modifié (`array.array`).
         """
-        tab_to_return=[]
-        for i in range (len(tab)):
-            tab_to_return.append(tab[i]+x)
-        return tab_to_return
+        return array(typecode(tab), (value+x for value in tab))
         
         
         